@@ -1 +1,27 @@
-import basic
\ No newline at end of file
+"""
+Package with basic utilities. Submodules (and their functions) are only imported when used, so
+importing basic is fast even if matplotlib, numpy, pandas or mpld3 are installed:
+
+    import basic
+    basic.parseString("1 2\n3 4", type="int")  # imports basic.basic
+    basic.plotLine([1, 2, 3], show=False)  # imports basic.basic_plot (and matplotlib)
+"""
+import importlib
+
+
+# Submodules, in the order they are searched for functions
+_SUBMODULES = ("basic", "basic_plot", "basic_plot_tooltip")
+
+
+def __getattr__(name):
+    if name in _SUBMODULES or name == "bench":
+        return importlib.import_module("." + name, __name__)
+    for submodule in _SUBMODULES:
+        module = importlib.import_module("." + submodule, __name__)
+        if not name.startswith("_") and hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
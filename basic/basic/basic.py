@@ -1,11 +1,22 @@
 #!/usr/bin/env python
 
 from __future__ import print_function  # convert print in function in python2, needs to be 1st line
+import io
 import re
+import os
 import sys
+import array
 import random
 import string
 import time
+import math
+import heapq
+import itertools
+import functools
+import collections
+import threading
+import importlib
+import atexit
 from datetime import timedelta, datetime
 
 
@@ -21,6 +32,55 @@ need them. This saves a lot of time of searching the Internet
 """
 
 
+class LazyModule(object):
+    """Placeholder for a module that is only imported the first time one of its attributes is used."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        try:
+            return getattr(self._module, attr)
+        except AttributeError:
+            if not hasattr(self._module, "__path__"):  # not a package, so it has no submodules
+                raise
+        # Submodules that have not been imported yet (e.g. concurrent.futures)
+        name = self._name + "." + attr
+        try:
+            return importlib.import_module(name)
+        except ImportError as e:
+            if getattr(e, "name", None) != name:  # the submodule exists, but it failed to import
+                raise
+        raise AttributeError("module '{}' has no attribute '{}'".format(self._name, attr))
+
+
+def lazyImport(name):
+    """Return a module that will only be imported when it is used. Good for heavy modules.
+
+    @use plt = lazyImport("matplotlib.pyplot")  # matplotlib is not imported yet
+    """
+    return LazyModule(name)
+
+
+# These modules are slow to import and only needed by a few functions
+asyncio = lazyImport("asyncio")
+subprocess = lazyImport("subprocess")
+concurrent = lazyImport("concurrent")
+multiprocessing = lazyImport("multiprocessing")
+sqlite3 = lazyImport("sqlite3")
+shelve = lazyImport("shelve")
+mmap = lazyImport("mmap")
+pickle = lazyImport("pickle")
+hashlib = lazyImport("hashlib")
+shutil = lazyImport("shutil")
+tempfile = lazyImport("tempfile")
+shlex = lazyImport("shlex")
+signal = lazyImport("signal")
+
+
 # Useful constants, the maximum and minimum possible integer
 # Python can treat bigger numbers, which are then trated as long integers.
 # If you may be using values higher than 2147483647 or lower than -2147483648,
@@ -90,6 +150,97 @@ def isFloat(string):
         return False
 
 
+# Same grammar as int() and float(): signs, surrounding spaces, underscores between digits, exponents, inf, nan
+_DIGITS = r"\d(?:_?\d)*"
+_INT_PATTERN = r"[+-]?" + _DIGITS
+_FLOAT_PATTERN = (r"[+-]?(?:(?:{0}\.(?:{0})?|\.{0}|{0})(?:[eE][+-]?{0})?|inf(?:inity)?|nan)").format(_DIGITS)
+_NUMBER_PATTERN = r"\s*(?:(?P<int>{})|(?P<float>{}))\s*\Z".format(_INT_PATTERN, _FLOAT_PATTERN)
+_NUMBER_REGEX = re.compile(_NUMBER_PATTERN, re.IGNORECASE)
+_NUMBER_REGEX_BYTES = re.compile(_NUMBER_PATTERN.encode(), re.IGNORECASE)
+_KIND_ORDER = {"int": 0, "float": 1, "other": 2}
+
+
+def classifyTokens(tokens):
+    """Return list with the kind of every token: "int", "float" or "other".
+
+    A token is "int" if isInt would return True, "float" if only isFloat would return True, and "other" otherwise.
+    No exceptions are raised and caught (like isInt and isFloat do), so it is much faster for many tokens.
+    Tokens can be str or bytes. A numpy array of fixed-width bytes (dtype "S") is checked with numpy.
+
+    @use classifyTokens(["1", "2.5", "1e3", "hello"]) --> ["int", "float", "float", "other"]
+    """
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(tokens, np.ndarray) and tokens.dtype.kind == "S":
+        return _classifyBytesArray(tokens, np)
+    match = _NUMBER_REGEX.match
+    match_bytes = _NUMBER_REGEX_BYTES.match
+    result = []
+    append = result.append
+    for token in tokens:
+        if isinstance(token, str):
+            if token.isdecimal():  # the most common case, exactly the digits accepted by int()
+                append("int")
+                continue
+            m = match(token)
+        elif isinstance(token, bytes):
+            if token.isdigit():
+                append("int")
+                continue
+            m = match_bytes(token)
+        elif isinstance(token, int):
+            append("int")
+            continue
+        elif isinstance(token, float):
+            append("float")
+            continue
+        else:
+            m = None
+        append(m.lastgroup if m else "other")
+    return result
+
+
+def _classifyBytesArray(tokens, np):
+    """classifyTokens for a numpy array of fixed-width bytes: ints are found with numpy, the rest with regex."""
+    tokens = tokens.ravel()
+    if tokens.size == 0 or tokens.itemsize == 0:
+        return ["other"] * tokens.size
+    chars = tokens.view(np.uint8).reshape(tokens.size, tokens.itemsize)
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    is_sign = np.zeros(chars.shape, dtype=bool)
+    is_sign[:, 0] = (chars[:, 0] == ord("+")) | (chars[:, 0] == ord("-"))
+    # numpy pads shorter tokens with null bytes at the end
+    is_int = np.all(is_digit | is_sign | (chars == 0), axis=1) & np.any(is_digit, axis=1)
+    result = np.where(is_int, "int", "other").astype(object)
+    rest = np.flatnonzero(~is_int)
+    if rest.size:
+        result[rest] = classifyTokens(tokens[rest].tolist())
+    return result.tolist()
+
+
+def inferColumnTypes(rows):
+    """Return the type of every column in rows (like the output of parseString): "int", "float" or "other".
+
+    A column is "int" if all its elements are ints, "float" if all are floats or ints, and "other" otherwise.
+    Rows can have different lengths, missing elements are ignored.
+
+    @use inferColumnTypes(parseString("1 2.5 a\n3 4 b")) --> ["int", "float", "other"]
+    """
+    if not isinstance(rows, (list, tuple)):
+        rows = list(rows)
+    num_columns = max([len(row) for row in rows] or [0])
+    types = []
+    for j in range(num_columns):
+        column = [row[j] for row in rows if len(row) > j]
+        kind = "int"
+        for token_kind in classifyTokens(column):
+            if _KIND_ORDER[token_kind] > _KIND_ORDER[kind]:
+                kind = token_kind
+                if kind == "other":
+                    break
+        types.append(kind)
+    return types
+
+
 def intToBinary(n, padding=None):
     """Return number as binary. Variable padding adds 0s to the left of the number."""
     if padding is None:
@@ -103,7 +254,13 @@ def binaryToInt(n):
 
 
 def calculateFactors(n):
-    """Calculate all divisors/factors of an integer n. e.g n=30, result={1,2,3,5,15}."""
+    """Calculate all divisors/factors of an integer n. e.g n=30, result={1,2,3,5,15}.
+
+    If the smallest prime factor table has been built (see buildFactorTable) and n is inside it,
+    the divisors are calculated from the prime factorization of n, which is much faster.
+    """
+    if _factor_table is not None and 0 < n < len(_factor_table):
+        return divisorsFromFactorization(primeFactorization(n))
     result = set()
     for i in range(1, int(n ** 0.5) + 1):
         div, mod = divmod(n, i)
@@ -112,6 +269,260 @@ def calculateFactors(n):
     return result
 
 
+# Smallest prime factor of every number below its length (built by buildFactorTable)
+_factor_table = None
+# Bases that make Miller-Rabin deterministic for every n < 2**64
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def buildFactorTable(limit=10 ** 7):
+    """Build (once) the table with the smallest prime factor of every number below limit.
+
+    Once built, primeFactorization, factorsMany and calculateFactors are much faster for numbers
+    below limit. The table uses 4 bytes per number (40 MB for the default limit).
+    The table is only rebuilt if a bigger limit is requested.
+
+    @use buildFactorTable(10 ** 6)
+    """
+    global _factor_table
+    if _factor_table is not None and len(_factor_table) >= limit:
+        return _factor_table
+    typecode = "I" if array.array("I").itemsize >= 4 else "L"
+    table = array.array(typecode, range(limit))
+    root = int(limit ** 0.5) + 1
+    small_primes = [p for p in range(2, root) if all(p % q for q in range(2, int(p ** 0.5) + 1))]
+    # Go from big to small primes, so the smallest prime factor is the one written last
+    for p in reversed(small_primes):
+        start = p * p
+        if start < limit:
+            table[start::p] = array.array(typecode, [p]) * len(range(start, limit, p))
+    _factor_table = table
+    return table
+
+
+def _isPrimeMillerRabin(n):
+    """Miller-Rabin test for odd n > 37. Deterministic for n < 2**64."""
+    d, r = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        r += 1
+    for a in _MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollardRho(n):
+    """Return a non-trivial factor of the odd composite n (Brent's variant of Pollard's rho)."""
+    rnd = random.Random(n)
+    while True:
+        y, c, m = rnd.randrange(1, n), rnd.randrange(1, n), 128
+        g, r, q = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def _factorizeBig(n, factors):
+    """Add the prime factors of n (with no factors below 41) to the dict factors."""
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if _factor_table is not None and m < len(_factor_table):
+            for p, e in primeFactorization(m).items():
+                factors[p] = factors.get(p, 0) + e
+        elif _isPrimeMillerRabin(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollardRho(m)
+            stack.append(d)
+            stack.append(m // d)
+
+
+def primeFactorization(n):
+    """Return dict {prime: exponent} with the prime factorization of the integer n > 0. e.g n=60, result={2:2,3:1,5:1}.
+
+    Uses the smallest prime factor table for numbers inside it (see buildFactorTable),
+    and trial division plus Pollard's rho for the rest. Raise ValueError if n < 1.
+
+    @use primeFactorization(2 ** 61 - 2)
+    """
+    if n < 1:
+        raise ValueError("only integers > 0 have a prime factorization, got {}".format(n))
+    factors = {}
+    table = _factor_table
+    if table is not None and n < len(table):
+        while n > 1:
+            p = table[n]
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            factors[p] = e
+        return factors
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % p == 0:
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            factors[p] = e
+    if n > 1:
+        _factorizeBig(n, factors)
+    return dict(sorted(factors.items()))
+
+
+def divisorsFromFactorization(factors):
+    """Return the set of all divisors of a number, given its prime factorization as {prime: exponent}.
+
+    @use divisorsFromFactorization({2: 1, 3: 1, 5: 1}) --> {1, 2, 3, 5, 6, 10, 15, 30}
+    """
+    divisors = [1]
+    for p, e in factors.items():
+        powers = [p ** i for i in range(1, e + 1)]
+        divisors += [d * pw for d in divisors for pw in powers]
+    return set(divisors)
+
+
+def isPrime(n):
+    """Return True if the integer n is prime, False otherwise.
+
+    Uses the smallest prime factor table if n is inside it (see buildFactorTable), otherwise
+    Miller-Rabin with fixed bases, which is deterministic (never wrong) for every n < 2**64.
+
+    @use isPrime(2 ** 61 - 1)
+    """
+    if n < 2:
+        return False
+    if _factor_table is not None and n < len(_factor_table):
+        return _factor_table[n] == n
+    for p in _MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+    return _isPrimeMillerRabin(n)
+
+
+def _simpleSieve(limit):
+    """Return list of all primes below limit (sieve of Eratosthenes)."""
+    if limit < 3:
+        return []
+    sieve = bytearray([1]) * limit
+    sieve[0] = sieve[1] = 0
+    for p in range(2, int(limit ** 0.5) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return list(itertools.compress(range(limit), sieve))
+
+
+def _sieveSegment(args):
+    """Return array with the odd primes in [lo, hi), with lo even, given all odd primes up to sqrt(hi)."""
+    lo, hi, odd_primes = args
+    # Only odd numbers are stored: position i is the number lo + 2 * i + 1
+    size = (hi - lo) // 2
+    segment = bytearray([1]) * size
+    for p in odd_primes:
+        start = max(p * p, (lo + p) // p * p)
+        if start % 2 == 0:
+            start += p
+        if start >= hi:
+            if p * p >= hi:
+                break
+            continue
+        first = (start - lo - 1) // 2
+        segment[first::p] = bytes(len(range(first, size, p)))
+    if lo == 0 and size > 0:
+        segment[0] = 0  # 1 is not prime
+    return array.array("q", (lo + 2 * i + 1 for i in itertools.compress(range(size), segment)))
+
+
+def iterPrimes(stop, start=2, segment_size=1 << 20, processes=None):
+    """Yield all primes p such that start <= p < stop, in order, using a segmented sieve of Eratosthenes.
+
+    Only one segment (segment_size numbers, stored as one byte per odd number) is in memory at a time,
+    so it can generate primes up to 10**10 and beyond.
+    If processes is set (>1), segments are sieved in parallel by a pool of that many processes.
+
+    @use for p in iterPrimes(100): print(p)
+    @use primes = sum(1 for _ in iterPrimes(10 ** 9, processes=8))
+    """
+    start = max(start, 0)
+    if stop <= start:
+        return
+    if start <= 2 < stop:
+        yield 2
+    segment_size += segment_size % 2
+    odd_primes = _simpleSieve(int(stop ** 0.5) + 2)[1:]
+    lo = start - start % 2
+    tasks = ((seg_lo, min(seg_lo + segment_size, stop + stop % 2), odd_primes)
+             for seg_lo in range(lo, stop, segment_size))
+    if processes is not None and processes > 1:
+        segments = _iterSegmentsParallel(tasks, processes)
+    else:
+        segments = map(_sieveSegment, tasks)
+    for primes in segments:
+        for p in primes:
+            if start <= p < stop:
+                yield p
+
+
+def _iterSegmentsParallel(tasks, processes):
+    """Yield the primes of every segment in order, sieved by a pool of processes.
+
+    At most 2 segments per process are sieved ahead, so memory does not grow if the consumer is slow.
+    """
+    pool = multiprocessing.Pool(processes)
+    try:
+        pending = collections.deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_sieveSegment, (task,)))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+def factorsMany(ns, limit=10 ** 7):
+    """Calculate all divisors of every integer in ns. Return a list of sets, like calculateFactors.
+
+    The smallest prime factor table is built once up to min(max(ns) + 1, limit) and reused for
+    all numbers, so this is much faster than calling calculateFactors for every number.
+
+    @use factorsMany(range(1, 1000000))
+    """
+    ns = list(ns)
+    if ns:
+        buildFactorTable(min(max(ns) + 1, limit))
+    return [divisorsFromFactorization(primeFactorization(n)) if n > 0 else set() for n in ns]
+
+
 def greatestCommonDivisor(a, b):
     """Calculate the greatest common divisor of a and b.
     
@@ -125,6 +536,112 @@ def greatestCommonDivisor(a, b):
     return a
 
 
+_GCD_CHUNK = 1024  # numbers reduced at once by gcdMany and lcmMany between checks for an early exit
+_MANY_ARGUMENT_GCD = sys.version_info >= (3, 9)  # math.gcd and math.lcm accept any number of arguments
+
+
+def gcdMany(seq):
+    """Return the greatest common divisor of all the integers in seq (always >= 0, 0 if seq is empty).
+
+    Numbers are reduced in chunks with math.gcd (or numpy for numpy arrays), and it stops as soon as
+    the result is 1, so it is much faster than calling greatestCommonDivisor for every number.
+
+    @use gcdMany([12, 18, 30]) --> 6
+    """
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(seq, np.ndarray) and seq.dtype.kind in "iu":
+        result = 0
+        seq = seq.ravel()
+        for i in range(0, len(seq), _GCD_CHUNK):
+            result = math.gcd(result, int(np.gcd.reduce(seq[i:i + _GCD_CHUNK])))
+            if result == 1:
+                break
+        return result
+    result = 0
+    iterator = iter(seq)
+    while True:
+        chunk = list(itertools.islice(iterator, _GCD_CHUNK))
+        if not chunk:
+            return result
+        if _MANY_ARGUMENT_GCD:
+            result = math.gcd(result, *chunk)
+        else:
+            for n in chunk:
+                result = math.gcd(result, n)
+        if result == 1:
+            return 1
+
+
+def lcmMany(seq):
+    """Return the least common multiple of all the integers in seq (always >= 0, 1 if seq is empty).
+
+    The result is a python int, so it does not overflow. It stops as soon as the result is 0.
+
+    @use lcmMany([4, 6, 10]) --> 60
+    """
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(seq, np.ndarray):
+        seq = seq.ravel().tolist()
+    result = 1
+    gcd = math.gcd
+    iterator = iter(seq)
+    while True:
+        chunk = list(itertools.islice(iterator, _GCD_CHUNK))
+        if not chunk:
+            return result
+        if _MANY_ARGUMENT_GCD:
+            result = math.lcm(result, *chunk)
+        else:
+            for n in chunk:
+                result = abs(result * n) // gcd(result, n) if n else 0
+        if result == 0:
+            return 0
+
+
+def gcdArray(a, b):
+    """Return the greatest common divisor of every pair of elements of a and b (numpy arrays or lists).
+
+    It uses numpy (element-wise, with broadcasting) and returns a numpy array. If numpy is not installed,
+    it returns a list.
+
+    @use gcdArray(numpy.array([12, 18, 7]), numpy.array([8, 27, 5])) --> array([4, 9, 1])
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [math.gcd(x, y) for x, y in zip(a, b)]
+    return np.gcd(a, b)
+
+
+def extendedGcd(a, b):
+    """Return (g, x, y) where g is the greatest common divisor of a and b (>= 0) and a*x + b*y == g.
+
+    @use extendedGcd(240, 46) --> (2, -9, 47)
+    """
+    (old_r, r) = (a, b)
+    (old_x, x) = (1, 0)
+    (old_y, y) = (0, 1)
+    while r:
+        q = old_r // r
+        (old_r, r) = (r, old_r - q * r)
+        (old_x, x) = (x, old_x - q * x)
+        (old_y, y) = (y, old_y - q * y)
+    if old_r < 0:
+        return -old_r, -old_x, -old_y
+    return old_r, old_x, old_y
+
+
+def modInverse(a, m):
+    """Return x in [0, m) such that a*x % m == 1. Raise ValueError if it does not exist (a and m not coprime).
+
+    @use modInverse(3, 11) --> 4
+    """
+    (g, x, _) = extendedGcd(a, m)
+    if g != 1:
+        raise ValueError("{} has no inverse modulo {}".format(a, m))
+    return x % m
+
+
 def isPalindrome(n):
     """Return True if n is palindrome, False otherwise."""
     return n == n[::-1]
@@ -185,38 +702,209 @@ def getFormatedElapsedTime(t0, t1=None):
     return "{}".format(timedelta(seconds=t1-t0))
 
 
+def describe(seq, total=True):
+    """Return dict with min, max, argmin, argmax, sum, count and mean of seq in a single pass.
+
+    seq can be any iterable (list, tuple, string, generator...). argmin and argmax are the indices
+    of the first min and max. numpy arrays and array.array are processed with numpy (if installed).
+    Set total to False to skip sum and mean (e.g. for strings). Empty seq gives None for min/max/argmin/argmax.
+
+    @use describe([3, 1, 4, 1, 5]) --> {"min": 1, "max": 5, "argmin": 1, "argmax": 4, "sum": 14, "count": 5, "mean": 2.8}
+    """
+    result = _describeNumpy(seq, total)
+    if result is not None:
+        return result
+    min_val = max_val = argmin = argmax = None
+    sum_val = 0
+    count = 0
+    it = iter(seq)
+    for val in it:
+        min_val = max_val = val
+        argmin = argmax = 0
+        sum_val = val if total else 0
+        count = 1
+        break
+    if total:
+        for val in it:
+            sum_val += val
+            if val > max_val:
+                max_val, argmax = val, count
+            elif val < min_val:
+                min_val, argmin = val, count
+            count += 1
+    else:
+        for val in it:
+            if val > max_val:
+                max_val, argmax = val, count
+            elif val < min_val:
+                min_val, argmin = val, count
+            count += 1
+    return {"min": min_val, "max": max_val, "argmin": argmin, "argmax": argmax, "count": count,
+            "sum": sum_val if total else None,
+            "mean": (float(sum_val) / max(count, 1)) if total else None}
+
+
+def _describeNumpy(seq, total):
+    """describe for numpy arrays and array.array, or None if seq is not one (or numpy is not installed)."""
+    np = sys.modules.get("numpy")
+    if isinstance(seq, array.array) and seq.typecode != "u":
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+        seq = np.frombuffer(seq, dtype=seq.typecode)
+    elif np is None or not isinstance(seq, np.ndarray):
+        return None
+    seq = seq.ravel()
+    if seq.size == 0:
+        return {"min": None, "max": None, "argmin": None, "argmax": None, "count": 0,
+                "sum": 0 if total else None, "mean": 0.0 if total else None}
+    argmin, argmax = int(np.argmin(seq)), int(np.argmax(seq))
+    sum_val = seq.sum().item() if total else None
+    return {"min": seq[argmin].item(), "max": seq[argmax].item(), "argmin": argmin, "argmax": argmax,
+            "count": int(seq.size), "sum": sum_val, "mean": float(sum_val) / seq.size if total else None}
+
+
+def _describeNotEmpty(seq):
+    """describe without sum and mean, that fails like max() and min() if seq is empty."""
+    result = describe(seq, total=False)
+    if result["count"] == 0:
+        raise ValueError("arg is an empty sequence")
+    return result
+
+
 def getMaxIndex(myList):
     """Get index of max value in a list."""
-    # For a faster implementation in big lists, try return numpy.argmax(myList)
-    return myList.index(max(myList))
+    return _describeNotEmpty(myList)["argmax"]
 
 
 def getMinIndex(myList):
     """Get index of min value in a list."""
-    # For a faster implementation in big lists, try return numpy.argmin(myList)
-    return myList.index(min(myList))
+    return _describeNotEmpty(myList)["argmin"]
 
 
 def getMaxAndIndex(myList):
     """Get tuple (max, index) of max value in a list."""
-    # For a faster implementation in big lists, try return numpy.argmax(myList)
-    max_val = max(myList)
-    return (max_val, myList.index(max_val))
+    result = _describeNotEmpty(myList)
+    return (result["max"], result["argmax"])
 
 
 def getMinAndIndex(myList):
     """Get tuple (min, index) of min value in a list."""
-    # For a faster implementation in big lists, try return numpy.argmin(myList)
-    min_val = min(myList)
-    return (min_val, myList.index(min_val))
+    result = _describeNotEmpty(myList)
+    return (result["min"], result["argmin"])
 
 
 def orderList(seq):
     """Order a list, a string, or a tuple."""
     # For lists, list.sort() is faster but overwrites original list
+    # For data that does not fit in memory, use externalSort
     return sorted(seq)
 
 
+def _writeSortedRun(items, key, reverse, folder):
+    """Sort items and save them in a new temporary file in folder. Return the filename."""
+    items.sort(key=key, reverse=reverse)
+    fd, filename = tempfile.mkstemp(prefix="run_", dir=folder)
+    with os.fdopen(fd, "wb") as f:
+        dump = _pickleDumper(f)
+        # Save items in batches, pickling them one by one would be much slower
+        for i in range(0, len(items), 1024):
+            dump(items[i:i + 1024])
+    return filename
+
+
+def _iterSortedRun(filename):
+    for batch in _iterPickled(filename):
+        for item in batch:
+            yield item
+
+
+# Maximum number of run files open at the same time while merging
+_MAX_MERGED_RUNS = 64
+
+
+def _mergeRuns(runs, key, reverse, folder):
+    """Merge the sorted run files in runs into a new run file (and delete them). Return the new filename."""
+    fd, filename = tempfile.mkstemp(prefix="run_", dir=folder)
+    with os.fdopen(fd, "wb") as f:
+        dump = _pickleDumper(f)
+        batch = []
+        for item in heapq.merge(*[_iterSortedRun(run) for run in runs], key=key, reverse=reverse):
+            batch.append(item)
+            if len(batch) >= 1024:
+                dump(batch)
+                batch = []
+        if batch:
+            dump(batch)
+    for run in runs:
+        os.remove(run)
+    return filename
+
+
+def externalSort(seq, key=None, reverse=False, memory_limit=10 ** 6, tmpdir=None, column=None, processes=None):
+    """Yield the elements of seq (any iterable) sorted, even if they do not fit in memory.
+
+    seq is read in runs of memory_limit elements, every run is sorted and saved in a temporary file
+    (with pickle), and all runs are merged with heapq.merge. The sort is stable, like sorted().
+    Use column to sort rows (like the ones from parseString or iterParse) by the element in that column.
+    If processes is set (>1), runs are sorted and saved by that many processes (key must be picklable).
+    Raise ValueError if memory_limit < 1.
+
+    @use for row in externalSort(iterParse("huge.txt", type="int"), column=2, memory_limit=10 ** 7): print(row)
+    """
+    if memory_limit < 1:
+        raise ValueError("memory_limit must be at least 1, got {}".format(memory_limit))
+    if column is not None:
+        key = _ColumnKey(column, key)
+    it = iter(seq)
+    first_run = list(itertools.islice(it, memory_limit))
+    if len(first_run) < memory_limit:
+        # Everything fits in memory
+        first_run.sort(key=key, reverse=reverse)
+        for item in first_run:
+            yield item
+        return
+    folder = tempfile.mkdtemp(prefix="basic_sort_", dir=tmpdir)
+    try:
+        runs = []
+        chunks = itertools.chain([first_run], iter(lambda: list(itertools.islice(it, memory_limit)), []))
+        if processes is not None and processes > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+                pending = []
+                for chunk in chunks:
+                    pending.append(executor.submit(_writeSortedRun, chunk, key, reverse, folder))
+                    if len(pending) >= processes:
+                        # Wait for the oldest run, so at most processes + 1 runs are in memory
+                        runs.append(pending.pop(0).result())
+                runs += [future.result() for future in pending]
+        else:
+            for chunk in chunks:
+                runs.append(_writeSortedRun(chunk, key, reverse, folder))
+        first_run = chunks = None
+        # Merge consecutive runs in groups (keeps the sort stable) until there are few enough to open them all
+        while len(runs) > _MAX_MERGED_RUNS:
+            runs = [_mergeRuns(runs[i:i + _MAX_MERGED_RUNS], key, reverse, folder)
+                    for i in range(0, len(runs), _MAX_MERGED_RUNS)]
+        for item in heapq.merge(*[_iterSortedRun(run) for run in runs], key=key, reverse=reverse):
+            yield item
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+class _ColumnKey(object):
+    """Picklable key function that returns key(row[column]) (or row[column] if key is None)."""
+
+    def __init__(self, column, key=None):
+        self.column = column
+        self.key = key
+
+    def __call__(self, row):
+        if self.key is None:
+            return row[self.column]
+        return self.key(row[self.column])
+
+
 def removeDuplicates(seq):
     """Remove repeated values from list, string, or tuple. Order will be lost. A list will be returned."""
     return list(set(seq))
@@ -226,7 +914,214 @@ def removeDuplicatesWithOrder(seq):
     """Remove repeated values from list, string, or tuple. Order will be kept. A list will be returned."""
     seen = set()
     seen_add = seen.add
-    return [x for x in seq if not (x in seen or seen_add(x))]
+    try:
+        return [x for x in seq if not (x in seen or seen_add(x))]
+    except TypeError:
+        # Some elements are not hashable (e.g. lists), use the slower iterUnique
+        return list(iterUnique(seq))
+
+
+# Tags used by canonicalKey, so a list and a tuple with the same elements get different keys
+_LIST_KEY, _TUPLE_KEY, _DICT_KEY, _SET_KEY, _BYTES_KEY, _REPR_KEY = (object() for _ in range(6))
+
+
+def canonicalKey(obj, strict=False):
+    """Return a hashable key for obj, equal for equal objects. Lists, dicts, sets... are converted recursively.
+
+    Other unhashable objects are converted using their repr, or raise TypeError if strict is True.
+
+    @use canonicalKey([1, [2, 3], {"a": 4}])
+    """
+    try:
+        hash(obj)
+        return obj
+    except TypeError:
+        pass
+    if isinstance(obj, (list, tuple)):
+        return (_LIST_KEY if isinstance(obj, list) else _TUPLE_KEY, tuple(canonicalKey(el, strict) for el in obj))
+    if isinstance(obj, dict):
+        return (_DICT_KEY, frozenset((canonicalKey(k, strict), canonicalKey(v, strict)) for k, v in obj.items()))
+    if isinstance(obj, (set, frozenset)):
+        return (_SET_KEY, frozenset(canonicalKey(el, strict) for el in obj))
+    if isinstance(obj, bytearray):
+        return (_BYTES_KEY, bytes(obj))
+    if strict:
+        raise TypeError("unhashable type: '{}'".format(type(obj).__name__))
+    # Last resort for other unhashable objects
+    return (_REPR_KEY, type(obj).__name__, repr(obj))
+
+
+def _dedupKey(item, key):
+    k = item if key is None else key(item)
+    try:
+        hash(k)
+        return k
+    except TypeError:
+        return canonicalKey(k)
+
+
+def iterUnique(seq, key=None):
+    """Yield the elements of seq (any iterable) skipping repeated ones. Order is kept.
+
+    Unlike removeDuplicatesWithOrder, elements do not need to be hashable (e.g. rows from parseString),
+    and they are yielded one by one. If key is set, two elements are repeated if key(element) is equal.
+
+    @use list(iterUnique([[1, 2], [3], [1, 2]])) --> [[1, 2], [3]]
+    """
+    seen = set()
+    seen_add = seen.add
+    for item in seq:
+        k = item if key is None else key(item)
+        try:
+            if k in seen:
+                continue
+            seen_add(k)
+        except TypeError:
+            k = canonicalKey(k)
+            if k in seen:
+                continue
+            seen_add(k)
+        yield item
+
+
+def _iterPickled(filename):
+    """Yield all objects saved with pickle.dump (one after another) in filename."""
+    with open(filename, "rb") as f:
+        while True:
+            try:
+                # A new unpickler for every object: a shared one would keep all of them in its memo
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _pickleDumper(f):
+    """Return function that saves one object in the open file f (see _iterPickled).
+
+    Every object is pickled alone: a shared Pickler would keep all of them in memory (in its memo).
+    """
+    return functools.partial(pickle.dump, file=f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def iterUniqueExternal(seq, key=None, max_items=10 ** 6, tmpdir=None, partitions=64):
+    """Yield the elements of seq skipping repeated ones (exactly), keeping at most max_items keys in memory.
+
+    Works like iterUnique until max_items different elements have been seen. From then on, new elements
+    are saved (with pickle) in partitions temporary files by hash, every partition is deduplicated alone,
+    and the results are merged back in the original order. Elements must be picklable.
+    Every partition should fit in memory: use more partitions for bigger inputs.
+
+    @use for row in iterUniqueExternal(iterParse("huge.txt"), max_items=10 ** 7): print(row)
+    """
+    seen = set()
+    files = None
+    folder = None
+    try:
+        for index, item in enumerate(seq):
+            k = _dedupKey(item, key)
+            if k in seen:
+                continue
+            if files is None:
+                if len(seen) < max_items:
+                    seen.add(k)
+                    yield item
+                    continue
+                folder = tempfile.mkdtemp(prefix="basic_unique_", dir=tmpdir)
+                files = [open(os.path.join(folder, "in_{}".format(i)), "wb") for i in range(partitions)]
+                dumpers = [_pickleDumper(f) for f in files]
+            dumpers[hash(k) % partitions]((index, item))
+        if files is None:
+            return
+        seen = None
+        for f in files:
+            f.close()
+        # Deduplicate every partition alone. Records are written in order, so outputs are sorted by index
+        outputs = []
+        for i in range(partitions):
+            output = os.path.join(folder, "out_{}".format(i))
+            with open(output, "wb") as f:
+                dump = _pickleDumper(f)
+                partition_seen = set()
+                for index, item in _iterPickled(os.path.join(folder, "in_{}".format(i))):
+                    k = _dedupKey(item, key)
+                    if k not in partition_seen:
+                        partition_seen.add(k)
+                        dump((index, item))
+            os.remove(os.path.join(folder, "in_{}".format(i)))
+            outputs.append(output)
+        for index, item in heapq.merge(*[_iterPickled(output) for output in outputs], key=lambda record: record[0]):
+            yield item
+    finally:
+        if files is not None:
+            for f in files:
+                f.close()
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+def _mix64(x):
+    """splitmix64 finalizer: spread the bits of a 64-bit integer."""
+    x = (x + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return x ^ (x >> 31)
+
+
+class BloomFilter(object):
+    """Set-like structure with a fixed size that may say an element was added when it was not.
+
+    It is sized so that, with capacity elements added, the probability of a false positive is error_rate.
+    It only uses ~1.2 bytes per element for error_rate=0.01, whatever the size of the elements.
+    Hashes are only valid in this process (they use hash()), so it can not be saved to disk.
+
+    @use bloom = BloomFilter(10 ** 9, 0.001)
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / float(capacity) * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        h1 = _mix64(hash(item) & 0xFFFFFFFFFFFFFFFF)
+        h2 = _mix64(h1) | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        """Add item. Return True if item was (probably) already added, False if it was not."""
+        bits = self.bits
+        found = True
+        for pos in self._positions(item):
+            byte = pos >> 3
+            mask = 1 << (pos & 7)
+            if not bits[byte] & mask:
+                found = False
+                bits[byte] |= mask
+        return found
+
+    def __contains__(self, item):
+        bits = self.bits
+        for pos in self._positions(item):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+def iterUniqueApprox(seq, capacity, error_rate=0.01, key=None):
+    """Yield the elements of seq skipping repeated ones, using a BloomFilter instead of a set.
+
+    Memory is fixed (~1.2 bytes per element for error_rate=0.01). Repeated elements are always removed,
+    but a small fraction (error_rate, if seq has at most capacity different elements) of the
+    non-repeated elements will be removed too. Order is kept.
+
+    @use for line in iterUniqueApprox(open("huge.txt"), capacity=10 ** 9, error_rate=0.001): print(line)
+    """
+    bloom_add = BloomFilter(capacity, error_rate).add
+    for item in seq:
+        if not bloom_add(_dedupKey(item, key)):
+            yield item
 
 
 def duplicateAllElementsList(seq, num_reps=2):
@@ -235,7 +1130,7 @@ def duplicateAllElementsList(seq, num_reps=2):
 
 
 def getRandomInt(minInt, maxInt=None):
-    """Return the next random floating point number (int) in the range [0.0, 1.0)."""
+    """Return a random integer N such that minInt<=N<=maxInt (or 0<=N<=minInt if maxInt is None)."""
     if maxInt is None:
         maxInt = minInt
         minInt = 0
@@ -244,7 +1139,7 @@ def getRandomInt(minInt, maxInt=None):
 
 def getRandomFloat(minFloat, maxFloat):
     """Return a random floating point number N such that a<=N<=b for a<=b and b<=N<=a for b<a."""
-    random.uniform(minFloat, maxFloat)
+    return random.uniform(minFloat, maxFloat)
 
 
 def getRandom():
@@ -257,28 +1152,109 @@ def getRandomElementInList(seq):
     return random.choice(seq)
 
 
+# Characters available for every char_set in getRandomChar and randomString
+CHAR_SETS = {
+    "letters": string.ascii_letters,
+    "lowercase": string.ascii_lowercase,
+    "uppercase": string.ascii_uppercase,
+    "digits": string.digits,
+    "letters_digits": string.ascii_letters + string.digits,
+    "all": string.ascii_letters + string.digits + string.punctuation,
+}
+
+
 def getRandomChar(char_set="lowercase"):
     """Return a random character. char_set can be used to select the character domain."""
-    if char_set == "letters":
-        str = string.ascii_letters
-    elif char_set == "lowercase":
-        str = string.ascii_lowercase
-    elif char_set == "uppercase":
-        str = string.ascii_uppercase
-    elif char_set == "digits":
-        str = string.digits
-    elif char_set == "letters_digits":
-        str = string.ascii_letters + string.digits
-    elif char_set == "all":
-        str = string.ascii_letters + string.digits + string.punctuation
-    else:
-        str = string.ascii_lowercase
-    return random.choice(str)
+    return random.choice(CHAR_SETS.get(char_set, string.ascii_lowercase))
+
+
+def getRandomGenerator(seed=None, worker=None, backend="python"):
+    """Return an independent random generator, so results can be reproduced (also with threads or processes).
+
+    Every worker (e.g. thread or process number) gets a different generator for the same seed.
+    If seed is None, the generator is seeded with fresh entropy (different in every call and run,
+    for every worker too), so results are not reproducible.
+    backend can be "python" (random.Random) or "numpy" (numpy.random.Generator).
+
+    @use rng = getRandomGenerator(seed=42, worker=thread_number)
+    """
+    if backend == "numpy":
+        import numpy as np
+        if worker is None or seed is None:
+            return np.random.default_rng(seed)
+        return np.random.default_rng([worker, seed])
+    if worker is None or seed is None:
+        return random.Random(seed)
+    return random.Random("{}-{}".format(seed, worker))
+
+
+def _getRng(rng, seed, backend):
+    if rng is not None:
+        return rng
+    if seed is not None or backend == "numpy":
+        return getRandomGenerator(seed, backend=backend)
+    return random  # the global random state, like getRandomInt and others
+
+
+def randomInts(n, minInt, maxInt=None, rng=None, seed=None, backend="python"):
+    """Return list of n random integers N such that minInt<=N<=maxInt (or 0<=N<=minInt if maxInt is None).
+
+    rng can be a generator from getRandomGenerator (otherwise one is created from seed, or the global
+    random state is used). If backend is "numpy", return a numpy array.
+
+    @use randomInts(10 ** 6, 1, 6, seed=42)
+    """
+    if maxInt is None:
+        maxInt = minInt
+        minInt = 0
+    rng = _getRng(rng, seed, backend)
+    if backend == "numpy":
+        return rng.integers(minInt, maxInt, size=n, endpoint=True)
+    if maxInt - minInt < 2 ** 53:
+        # choices picks floor(random() * len), which is exact while the range fits in a float
+        return rng.choices(range(minInt, maxInt + 1), k=n)
+    randint = rng.randint
+    return [randint(minInt, maxInt) for _ in range(n)]
+
+
+def randomFloats(n, minFloat=0.0, maxFloat=1.0, rng=None, seed=None, backend="python"):
+    """Return list of n random floats N such that minFloat<=N<=maxFloat.
+
+    rng, seed and backend work like in randomInts.
+
+    @use randomFloats(10 ** 6, -1.0, 1.0, seed=42)
+    """
+    rng = _getRng(rng, seed, backend)
+    if backend == "numpy":
+        return rng.uniform(minFloat, maxFloat, size=n)
+    rnd = rng.random
+    span = maxFloat - minFloat
+    return [minFloat + span * rnd() for _ in range(n)]
+
+
+def randomString(length, char_set="lowercase", rng=None, seed=None, backend="python"):
+    """Return a random string of length characters. char_set is like in getRandomChar, or a string of characters.
+
+    rng, seed and backend work like in randomInts.
+
+    @use randomString(16, "letters_digits", seed=42)
+    """
+    chars = CHAR_SETS.get(char_set, char_set if char_set else string.ascii_lowercase)
+    rng = _getRng(rng, seed, backend)
+    if backend == "numpy" and max(chars) < "\x80":
+        import numpy as np
+        codes = np.frombuffer(chars.encode(), dtype=np.uint8)
+        return codes[rng.integers(0, len(chars), size=length)].tobytes().decode()
+    if backend == "numpy":
+        return "".join(chars[i] for i in rng.integers(0, len(chars), size=length))
+    return "".join(rng.choices(chars, k=length))
 
 
 def mean(myList):
-    """Calculate the average / mean value in a list of ints or floats."""
-    return float(sum(myList)) / max(len(myList), 1)
+    """Calculate the average / mean value in a list (or any iterable) of ints or floats."""
+    if isinstance(myList, (list, tuple)):
+        return float(sum(myList)) / max(len(myList), 1)  # sum is faster than describe if we have the length
+    return describe(myList)["mean"]
 
 
 def removeExtraSpaces(string):
@@ -286,7 +1262,8 @@ def removeExtraSpaces(string):
 
     @use removeExtraSpaces(" Hello   World     I am  Daniel  ")
     """
-    return re.sub("\s+", " ", string).strip()
+    # str.split() without arguments splits on the same spaces as regex \s+ and drops them at the ends
+    return " ".join(string.split())
 
 
 def printSeparator(character="-", length=64):
@@ -314,24 +1291,21 @@ def returnTableRow(widthCol, *columns, align="left"):
     if not isinstance(widthCol, int):
         print("ERROR: returnTableRow(widthCol, *columns, align=align)")
         return ""
-    align = align.lower()
-    if align == "left":
-        cell = "{:<" + str(widthCol) + "}"
-    elif align == "right":
-        cell = "{:>" + str(widthCol) + "}"
-    elif align == "center":
-        cell = "{:^" + str(widthCol) + "}"
-    else:
+    cell = _tableCell(widthCol, align.lower())
+    if cell is None:
         print("ERROR: align can only take values: left, right, center")
         return ""
-    buff = ""
-    for col in columns:
-        if isinstance(col, list) or isinstance(col, tuple):
-            for ccol in col:
-                buff += cell.format(ccol)
-        else:
-            buff += cell.format(col)
-    return buff
+    return "".join([cell.format(ccol) for col in columns
+                    for ccol in (col if isinstance(col, (list, tuple)) else (col,))])
+
+
+@functools.lru_cache(maxsize=64)
+def _tableCell(widthCol, align):
+    """Return format string for one cell of a table, or None if align is not valid."""
+    symbol = {"left": "<", "right": ">", "center": "^"}.get(align)
+    if symbol is None:
+        return None
+    return "{:" + symbol + str(widthCol) + "}"
 
 
 def returnTableRowLeft(widthCol, *columns):
@@ -385,31 +1359,110 @@ def printNice(myList, print_result=True):
     return buff
 
 
-def printNicer(myList, widthCol=None, side="left"):
+def printNicer(myList, widthCol=None, side="left", print_result=True):
     """Print every element of a list in a different line, and subelements in different columns. Good for matrices.
 
     Select width column or it will find optimal, and set side align (left, right)
 
     @use printNicer(["This is nice", [1,10,100], [20, 10, 0]])
     """
-    if widthCol is None:
-        widthCol = 0
-        for el in myList:
-            if isinstance(el, list) or isinstance(el, tuple):
-                for subel in el:
-                    widthCol = max(widthCol, len(str(subel)))
-        widthCol += 2
-    buff = ""
-    for el in myList:
-        if side == "left":
-            buff += returnTableRowLeft(widthCol, el)
-        else:
-            buff += returnTableRowRight(widthCol, el)
+    output = io.StringIO()
+    with TableWriter(output, widthCol, align=side if side == "left" else "right", sample_rows=None) as table:
+        table.writerows(myList)
+    buff = output.getvalue()
     if print_result:
         print(buff)
     return buff
 
 
+class TableWriter(object):
+    """Write a table (a list of rows, every row a list of cells) into a file object, row by row.
+
+    Rows are formatted like printNicer does, but they are written as they come, so tables with millions
+    of rows do not need to be in memory. The format of every row is built once and reused.
+    If widthCol is None, the column width is calculated from the first sample_rows rows (from all of them,
+    like printNicer, if sample_rows is None). Cells longer than the width will not be aligned.
+
+    @use with TableWriter(sys.stdout, align="right") as table:
+             table.writerows(parseString(readFile("matrix.txt")))
+    """
+
+    def __init__(self, file=None, widthCol=None, align="left", sample_rows=1000, batch_rows=1000):
+        self.file = file if file is not None else sys.stdout
+        self.widthCol = widthCol
+        self.align = align.lower()
+        self.sample_rows = sample_rows
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self._pending = []  # rows waiting for the column width to be known
+        self._lines = []  # formatted lines waiting to be written
+        self._formats = {}  # number of columns -> format of the whole row
+        if self.widthCol is not None:
+            self._setWidth(self.widthCol)
+
+    def _setWidth(self, widthCol):
+        self.widthCol = widthCol
+        self._cell = _tableCell(widthCol, self.align)
+        if self._cell is None:
+            raise ValueError("align can only take values: left, right, center")
+
+    def writerow(self, row):
+        """Add one row to the table (a list or tuple of cells, or a single value)."""
+        if self.widthCol is None:
+            self._pending.append(row)
+            if self.sample_rows is not None and len(self._pending) >= self.sample_rows:
+                self._writePending()
+            return
+        if isinstance(row, (list, tuple)):
+            fmt = self._formats.get(len(row))
+            if fmt is None:
+                fmt = self._formats[len(row)] = self._cell * len(row) + "\n"
+            self._lines.append(fmt.format(*row))
+        else:
+            self._lines.append(self._cell.format(row) + "\n")
+        self.rows_written += 1
+        if len(self._lines) >= self.batch_rows:
+            self._writeLines()
+
+    def writerows(self, rows):
+        """Add all rows in rows (any iterable) to the table."""
+        for row in rows:
+            self.writerow(row)
+
+    def flush(self):
+        """Write all rows added so far to the file (the column width is fixed from now on)."""
+        self._writePending()
+        self._writeLines()
+        if hasattr(self.file, "flush"):
+            self.file.flush()
+
+    def close(self):
+        """Write all remaining rows. The file is not closed."""
+        self.flush()
+
+    def _writePending(self):
+        if self.widthCol is None:
+            widthCol = 0
+            for row in self._pending:
+                if isinstance(row, (list, tuple)):
+                    for cell in row:
+                        widthCol = max(widthCol, len(str(cell)))
+            self._setWidth(widthCol + 2)
+        pending, self._pending = self._pending, []
+        self.writerows(pending)
+
+    def _writeLines(self):
+        if self._lines:
+            self.file.write("".join(self._lines))
+            self._lines = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def indentString(s, indent="  "):
     """Add indent to the left of every line in a string.
 
@@ -418,6 +1471,84 @@ def indentString(s, indent="  "):
     return indent + str(s).replace("\n", "\n" + indent)
 
 
+class LineStream(object):
+    """Lazy pipeline of text transformations over the lines of a file (or any iterable of lines).
+
+    Every step (stripSpaces, indent, filter, map, replace) returns a new LineStream and does nothing yet.
+    Lines are read, transformed and written one by one when the stream is iterated or written with to(),
+    so files of any size can be processed in constant memory. Lines do not include the line jump.
+
+    @use stream("big.log").stripSpaces().filter(containsChars).indent("  ").to("clean.log")
+    """
+
+    def __init__(self, lines):
+        self._lines = lines
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def map(self, fn):
+        """Replace every line with fn(line)."""
+        return LineStream(map(fn, self._lines))
+
+    def filter(self, fn):
+        """Keep only the lines where fn(line) is True (like containsChars)."""
+        return LineStream(line for line in self._lines if fn(line))
+
+    def stripSpaces(self):
+        """Remove extra spaces of every line (see removeExtraSpaces)."""
+        return LineStream(" ".join(line.split()) for line in self._lines)
+
+    def indent(self, indent="  "):
+        """Add indent to the left of every line (see indentString)."""
+        return LineStream(indent + line for line in self._lines)
+
+    def replace(self, pattern, repl):
+        """Replace regex pattern (compiled only once) with repl in every line (see re.sub)."""
+        sub = re.compile(pattern).sub
+        return LineStream(sub(repl, line) for line in self._lines)
+
+    def to(self, filename, append=False, buffer_size=1 << 16, print_input=False):
+        """Write all lines into filename (see FileWriter), and return the number of lines written."""
+        count = 0
+        with FileWriter(filename, append=append, buffer_size=buffer_size, print_input=print_input) as f:
+            for line in self._lines:
+                f.write(line + "\n")
+                count += 1
+        return count
+
+
+def stream(source):
+    """Return a LineStream over the lines of source: a filename, a file object or an iterable of lines.
+
+    @use stream("big.log").stripSpaces().to("clean.log")
+    """
+    if isinstance(source, str):
+        return LineStream(_iterFileLines(source))
+    return LineStream(line.rstrip("\n") for line in source)
+
+
+def _iterFileLines(filename):
+    """Yield the lines of the file filename without the line jump, opening the file when first needed."""
+    with open(filename, "r") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def stringToInt(string):
+    """Convert a string containing a number to an integer. Accepts numbers like 1.55e8 too.
+
+    Integers are casted directly, so big numbers (above 2**53) do not lose precision.
+
+    @use stringToInt("1.55e8")
+    """
+    try:
+        return int(string)
+    except ValueError:
+        # We do this double cast to avoid errors and accept numbers like 1.55e8
+        return int(float(string))
+
+
 def convertListToInt(myList):
     """Convert a list or a list of lists to integers. The original list will be overwritten.
     
@@ -428,11 +1559,9 @@ def convertListToInt(myList):
     for i, el in enumerate(myList):
         if isinstance(el, list):
             for j, subel in enumerate(el):
-                # We do this double cast to avoid errors and accept numbers like 1.55e8
-                myList[i][j] = int(float(myList[i][j]))
+                myList[i][j] = stringToInt(myList[i][j])
         else:
-            # We do this double cast to avoid errors and accept numbers like 1.55e8
-            myList[i] = int(float(myList[i]))
+            myList[i] = stringToInt(myList[i])
     return myList
 
 
@@ -452,21 +1581,28 @@ def convertListToFloat(myList):
     return myList
 
 
-def parseString(input, type=None):
+def parseString(input, type=None, output="list"):
     """Convert a string with elements separated by spaces and line-jumps to a list of lists.
 
     Every line will become a list of all its elements.
     If type is set to "int" or "float", all elements in the list will be casted to such type.
+    For big numeric inputs, output can be set to "array" or "numpy" (type must be "int" or "float"):
+        "array": list of array.array (one per line), ~4 times smaller than a list of lists
+        "numpy": 2D numpy array, empty lines are skipped and all other lines must have the same length
     
     Example:
         IN:  1 2 3\n4 5
         OUT: [[1, 2, 3], [4, 5]]
     
     @use parseString("3\n1 2 4\n2 2\n4 2 1\nhello world")
+    @use parseString("1 2 3\n4 5 6", type="int", output="numpy")
     """
+    if output != "list":
+        return parseStringToArray(input, type, output)
     lines = input.split("\n")
     array = []
-    [array.append(removeExtraSpaces(line).split()) for line in lines]
+    # str.split() without arguments drops the same whitespace as removeExtraSpaces
+    [array.append(line.split()) for line in lines]
     if type is not None:
         if type == "int":
             convertListToInt(array)
@@ -475,6 +1611,108 @@ def parseString(input, type=None):
     return array
 
 
+def parseStringToArray(input, type="int", output="array"):
+    """Convert a string with numbers separated by spaces and line-jumps to compact typed arrays.
+
+    If output is "array", return a list with an array.array (typecode "q" or "d") for every line.
+    If output is "numpy", return a 2D numpy array (int64 or float64). Empty lines are skipped,
+    and every other line must have the same number of elements (ValueError otherwise).
+    Elements are stored as C numbers instead of Python objects, so it uses a fraction of the memory.
+    Ints must be between -2**63 and 2**63 - 1 (OverflowError otherwise): use parseString for bigger ones.
+
+    @use parseStringToArray("1 2 3\n4 5 6", type="int", output="numpy")
+    """
+    if type == "int":
+        typecode, cast = "q", stringToInt
+    elif type == "float":
+        typecode, cast = "d", float
+    else:
+        print("ERROR: type can only take values: int, float")
+        return []
+    if output not in {"array", "numpy"}:
+        print("ERROR: output can only take values: list, array, numpy")
+        return []
+    try:
+        if output == "array":
+            return [array.array(typecode, map(cast, line.split())) for line in input.split("\n")]
+        return _parseStringToNumpy(input, typecode, cast)
+    except OverflowError:
+        raise OverflowError("parseStringToArray only accepts ints between -2**63 and 2**63 - 1, "
+                            "use parseString for bigger ones")
+
+
+def _parseStringToNumpy(input, typecode, cast):
+    import numpy as np
+    # Fill one flat array and reshape it at the end, so we never build a list of lists
+    flat = array.array(typecode)
+    num_rows = 0
+    width = None
+    for line in input.split("\n"):
+        row = line.split()
+        if row:
+            if width is None:
+                width = len(row)
+            elif len(row) != width:
+                raise ValueError("row {} has {} elements, but the first row has {}".format(
+                    num_rows + 1, len(row), width))
+            flat.extend(map(cast, row))
+            num_rows += 1
+    result = np.frombuffer(flat, dtype=np.int64 if typecode == "q" else np.float64)
+    if num_rows == 0:
+        return result.reshape(0, 0)
+    return result.reshape(num_rows, width)
+
+
+def _iterSourceLines(source):
+    """Yield the lines (str) in source, splitting the items that contain many lines."""
+    for item in source:
+        if isinstance(item, bytes):
+            item = item.decode()
+        if "\n" not in item[:-1]:
+            yield item
+            continue
+        lines = item.split("\n")
+        for line in lines[:-1]:
+            yield line + "\n"
+        if lines[-1]:
+            yield lines[-1]
+
+
+def iterParse(source, type=None):
+    """Yield the lines of a file one by one, split in elements like parseString does.
+
+    source can be a filename, an open file object or any iterable of lines (str or bytes). Items with
+    many lines, like the chunks of readFileChunks or readFileArgument(mode="chunks"), are split in lines.
+    Only one line (or chunk) is kept in memory at a time, so it can be used on files bigger than memory.
+    If type is set to "int" or "float", all elements in every line will be casted to such type.
+    list(iterParse(f, type)) returns the same as parseString(f.read(), type).
+
+    @use for row in iterParse("my_file.txt", type="int"): print(sum(row))
+    """
+    if isinstance(source, str):
+        with open(source, "r") as f:
+            for row in iterParse(f, type):
+                yield row
+        return
+    if type == "int":
+        cast = stringToInt
+    elif type == "float":
+        cast = float
+    else:
+        cast = None
+    ends_with_newline = True  # an empty source is parsed as one empty line, like "".split("\n")
+    for line in _iterSourceLines(source):
+        ends_with_newline = line.endswith("\n")
+        # str.split() without arguments drops the same whitespace as removeExtraSpaces
+        row = line.split()
+        if cast is not None:
+            row = [cast(el) for el in row]
+        yield row
+    if ends_with_newline:
+        # "1 2\n".split("\n") is ["1 2", ""], so parseString returns a last empty line
+        yield []
+
+
 def readFile(filename, default="", print_input=False):
     """Return the file in filename as a string. If there is any problem, return default.
 
@@ -493,6 +1731,130 @@ def readFile(filename, default="", print_input=False):
     return default
 
 
+def readFileMapped(filename, default=None, print_input=False):
+    """Return a read-only mmap of the file in filename (bytes). If there is any problem, return default.
+
+    Nothing is copied or decoded: the OS loads the pages of the file when they are accessed.
+    Use memoryview(m) to slice it without copies, and m.close() (or a with block) when done.
+    Empty files can not be mapped, so for them it returns b"" (like default, it can not be used
+    in a with block or closed): check the result before using it as a context manager.
+
+    @use with readFileMapped("my_file.txt") as m: print(m.count(b"\n"))
+    @use m = readFileMapped("maybe_empty.txt", default=b"")
+         if isinstance(m, mmap.mmap):
+             with m: print(m.count(b"\n"))
+    """
+    try:
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                default = b""  # empty files cannot be mapped
+            else:
+                default = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if print_input:
+            print("File [{}] mapped".format(filename))
+    except (IOError, ValueError):
+        if print_input:
+            print("Error in filename, using default input")
+    return default
+
+
+def readFileChunks(filename, default=None, print_input=False, block_size=1 << 20):
+    """Return an iterator over the file in filename, in chunks of ~block_size characters.
+
+    Every chunk ends at the end of a line (lines are never split between chunks), so a chunk can be
+    longer than block_size if a line is. If there is any problem opening the file, return default.
+    Use iterParse(readFileChunks(filename)) to get the rows of every line.
+
+    @use for chunk in readFileChunks("my_file.txt", block_size=4096): print(len(chunk))
+    """
+    try:
+        f = open(filename, "r")
+        if print_input:
+            print("File [{}] opened".format(filename))
+    except IOError:
+        if print_input:
+            print("Error in filename, using default input")
+        return default
+    return _iterFileChunks(f, block_size)
+
+
+def _iterFileChunks(f, block_size):
+    """Yield chunks of complete lines read from f, and close f at the end."""
+    with f:
+        remainder = []  # start of a line that has not ended yet (it may be longer than block_size)
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            end = block.rfind("\n") + 1
+            if end == 0:
+                remainder.append(block)
+                continue
+            remainder.append(block[:end])
+            yield "".join(remainder)
+            remainder = [block[end:]] if end < len(block) else []
+        if remainder:
+            yield "".join(remainder)
+
+
+def _parseFilesWorker(args):
+    """Read and parse a chunk of files. Return list of (filename, result, error) for every file."""
+    filenames, type, output, default = args
+    results = []
+    for filename in filenames:
+        # Any error (undecodable file, int too big for an array...) only affects its own file
+        try:
+            content = readFile(filename, None)
+            if content is None:
+                results.append((filename, default, "Error while reading file [{}]".format(filename)))
+                continue
+            results.append((filename, parseString(content, type, output), None))
+        except Exception as e:
+            results.append((filename, default, "Error while reading or parsing file [{}]: {}: {}".format(
+                filename, e.__class__.__name__, e)))
+    return results
+
+
+def parseFiles(filenames, type=None, workers=None, ordered=True, output=None, default=None, chunksize=8,
+               print_input=False):
+    """Read and parse (see parseString) many files in parallel. Yield tuples (filename, result, error).
+
+    Files are split in chunks of chunksize files, and every chunk is read and parsed by one of the
+    workers processes (all CPUs if None). If ordered is False, results are yielded as soon as they are ready.
+    output is like in parseString; by default it is "array" if type is set, so results are sent back
+    from the workers as compact arrays instead of lists of lists.
+    If a file can not be read or parsed, result will be default and error will contain the reason
+    (error is None otherwise).
+
+    @use for filename, rows, error in parseFiles(filenames, type="int", workers=8): print(filename, len(rows))
+    """
+    if output is None:
+        output = "array" if type in {"int", "float"} else "list"
+    filenames = list(filenames)
+    chunks = [(filenames[i:i + chunksize], type, output, default) for i in range(0, len(filenames), chunksize)]
+    if workers == 1:
+        results = (_parseFilesWorker(chunk) for chunk in chunks)
+        for result in _reportParsedFiles(results, print_input):
+            yield result
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            results = executor.map(_parseFilesWorker, chunks)
+        else:
+            futures = [executor.submit(_parseFilesWorker, chunk) for chunk in chunks]
+            results = (future.result() for future in concurrent.futures.as_completed(futures))
+        for result in _reportParsedFiles(results, print_input):
+            yield result
+
+
+def _reportParsedFiles(chunk_results, print_input):
+    for chunk_result in chunk_results:
+        for filename, result, error in chunk_result:
+            if print_input:
+                print(error if error is not None else "File [{}] parsed".format(filename))
+            yield filename, result, error
+
+
 def writeFile(filename, content, print_input=False, append=False):
     """Write content into filename and return True. If there is any problem, return False.
     
@@ -516,15 +1878,113 @@ def writeFile(filename, content, print_input=False, append=False):
     return True
 
 
-def readFileArgument(default_input="", print_input=False):
+class FileWriter(object):
+    """Keep a file open and write content into it in big blocks, instead of calling writeFile many times.
+
+    Writes are kept in memory until buffer_size characters are stored, and then written all together.
+    If append is True, if the file exists content will be appended instead of overwritten.
+    sync selects when the data is forced to disk with os.fsync:
+        None: never (the OS decides), "close": only when closed, int N: every N bytes written
+    Counters bytes_written (encoded bytes, as saved in the file), flushes and syncs can be checked at any time.
+
+    @use with FileWriter("my_file.txt", append=True) as f:
+             for i in range(1000000): f.write("{}\n".format(i))
+    """
+
+    def __init__(self, filename, append=False, buffer_size=1 << 16, sync=None, print_input=False):
+        if sync is not None and sync != "close" and (not isinstance(sync, int) or isinstance(sync, bool)):
+            raise ValueError("sync can only take values: None, \"close\" or an int, got {!r}".format(sync))
+        op = "w+" if not append else "a+"
+        self.filename = filename
+        self.append = append
+        self.buffer_size = buffer_size
+        self.sync = sync
+        self.print_input = print_input
+        self.bytes_written = 0
+        self.flushes = 0
+        self.syncs = 0
+        self._buffer = []
+        self._buffered = 0
+        self._unsynced = 0
+        self._file = open(filename, op)
+
+    def write(self, content):
+        """Add content to the buffer, and write the buffer to the file if it is full. Return True."""
+        if self._file.closed:
+            raise ValueError("I/O operation on closed file")
+        self._buffer.append(content)
+        self._buffered += len(content)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Write all buffered content to the file (and fsync it if required by sync)."""
+        if self._buffer:
+            content = "".join(self._buffer)
+            self._file.write(content)
+            self._file.flush()
+            size = self._encodedSize(content)
+            self.bytes_written += size
+            self._unsynced += size
+            self.flushes += 1
+            self._buffer = []
+            self._buffered = 0
+        if isinstance(self.sync, int) and self._unsynced >= self.sync:
+            self._fsync()
+
+    def close(self):
+        """Flush remaining content and close the file. Return True."""
+        if self._file.closed:
+            return True
+        self.flush()
+        if self.sync is not None and self._unsynced > 0:
+            self._fsync()
+        self._file.close()
+        if self.print_input:
+            if self.append:
+                print("File [{}] appended".format(self.filename))
+            else:
+                print("File [{}] saved".format(self.filename))
+        return True
+
+    def _encodedSize(self, content):
+        """Return the number of bytes content takes in the file."""
+        # ASCII text (the usual case) has one byte per character, no need to encode it again
+        size = len(content) if content.isascii() else len(content.encode(self._file.encoding, self._file.errors))
+        if os.linesep != "\n":  # text files write "\n" as os.linesep
+            size += content.count("\n") * (len(os.linesep) - 1)
+        return size
+
+    def _fsync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self.syncs += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def readFileArgument(default_input="", print_input=False, mode="read", block_size=1 << 20):
     """Return the content of a filename passed as an argument. If it fails, return default_input.
 
     The filename has to be the first argument passed (sys.argv[1]).
+    mode selects how the file is read: "read" (string, see readFile), "mmap" (see readFileMapped, it may
+    also return b"" or default_input, which are not mmaps) or "chunks" (iterator of strings of ~block_size
+    characters with many lines each, see readFileChunks; iterParse can parse them).
 
     @use readFileArgument("Error while reading the file")
+    @use readFileArgument(mode="chunks", block_size=4096)
     """
     if len(sys.argv) > 1:
-        readFile(sys.argv[1], default_input, print_input)
+        if mode == "mmap":
+            return readFileMapped(sys.argv[1], default_input, print_input)
+        if mode == "chunks":
+            return readFileChunks(sys.argv[1], default_input, print_input, block_size)
+        return readFile(sys.argv[1], default_input, print_input)
     else:
         if print_input:
             print("No input file name argument, using default input:")
@@ -554,11 +2014,72 @@ def callProcess(process, cwd=None):
 
     @use callProcess("ls -l -A", "my_relative_or_absolute_path")
     """
-    cmd = process.split()
+    cmd = shlex.split(process)
     p = subprocess.Popen(cmd, cwd=cwd)
     p.wait()
 
 
+def _killProcessGroup(p):
+    """Kill process p and (on POSIX, where it leads its own group) all processes it started."""
+    try:
+        if os.name == "posix":
+            os.killpg(p.pid, signal.SIGKILL)
+        else:
+            p.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _runProcessAsync(cmd, cwd, timeout, semaphore):
+    """Run one command (when semaphore allows it) and return dict with its results."""
+    args = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+    result = {"cmd": cmd, "returncode": None, "stdout": b"", "stderr": b"", "elapsed": 0.0, "timed_out": False}
+    async with semaphore:
+        t0 = time.perf_counter()
+        try:
+            # In its own process group (POSIX), so a timeout also kills the processes it starts
+            p = await asyncio.create_subprocess_exec(*args, cwd=cwd, stdout=asyncio.subprocess.PIPE,
+                                                     stderr=asyncio.subprocess.PIPE,
+                                                     start_new_session=(os.name == "posix"))
+        except OSError as e:
+            result["stderr"] = str(e).encode()
+            result["elapsed"] = time.perf_counter() - t0
+            return result
+        try:
+            # communicate reads stdout and stderr at the same time, so full pipes never block the process
+            result["stdout"], result["stderr"] = await asyncio.wait_for(p.communicate(), timeout)
+        except asyncio.TimeoutError:
+            result["timed_out"] = True
+            _killProcessGroup(p)
+            try:
+                # Processes started by the command that are still alive could keep the pipes open
+                result["stdout"], result["stderr"] = await asyncio.wait_for(p.communicate(), 1)
+            except asyncio.TimeoutError:
+                await p.wait()
+        result["returncode"] = p.returncode
+        result["elapsed"] = time.perf_counter() - t0
+    return result
+
+
+async def runProcessesAsync(cmds, concurrency=8, cwd=None, timeout=None):
+    """Coroutine version of runProcesses, to use it from code that already runs an asyncio loop."""
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*[_runProcessAsync(cmd, cwd, timeout, semaphore) for cmd in cmds])
+
+
+def runProcesses(cmds, concurrency=8, cwd=None, timeout=None):
+    """Run many commands at the same time (at most concurrency at once), and wait for all of them.
+
+    Every command can be a string (split like a shell would do) or a list of arguments.
+    timeout (seconds) is the time every command can run before being killed.
+    Return a list (in the same order as cmds) of dicts with keys: cmd, returncode, stdout, stderr (bytes),
+    elapsed (seconds) and timed_out. If a command could not be started, returncode is None.
+
+    @use runProcesses(["ls -l -A", "sleep 1", "echo hello"], concurrency=2, timeout=10)
+    """
+    return asyncio.run(runProcessesAsync(cmds, concurrency, cwd, timeout))
+
+
 def askYNQuestion(question, message_on_failure=False):
     """Ask question and repeat it until the user responds yes or no. Return True (Y) or False (N)."""
     answer = ""
@@ -567,9 +2088,334 @@ def askYNQuestion(question, message_on_failure=False):
     return answer[0] == "y"
 
 
+# Set environment variable BASIC_PROFILING=0 to turn @profiled into a no-op (zero overhead)
+PROFILING_ENABLED = os.environ.get("BASIC_PROFILING", "1").lower() not in {"0", "false", "no", "off"}
+# name -> [number of calls, total time, max time]
+PROFILE_STATS = {}
+_profile_lock = threading.Lock()
+try:
+    _profile_timer = time.perf_counter
+except AttributeError:
+    _profile_timer = getTime  # python2
+
+
+def _recordProfile(name, elapsed):
+    with _profile_lock:
+        stats = PROFILE_STATS.get(name)
+        if stats is None:
+            PROFILE_STATS[name] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+
+class _ProfiledBlock(object):
+    """Context manager (and decorator) that records the time spent inside it under a name."""
+
+    def __init__(self, name):
+        self.name = name
+        self._local = threading.local()  # a stack per thread, so the same block can be nested or reused
+
+    def __enter__(self):
+        if self.name is None:
+            raise ValueError("profiled needs a name when used in a with block: with profiled(\"name\"): ...")
+        if PROFILING_ENABLED:
+            t0 = getattr(self._local, "t0", None)
+            if t0 is None:
+                t0 = self._local.t0 = []
+            t0.append(_profile_timer())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        t0 = getattr(self._local, "t0", None)
+        if PROFILING_ENABLED and t0:
+            _recordProfile(self.name, _profile_timer() - t0.pop())
+
+    def __call__(self, fn):
+        name = self.name if self.name is not None else getattr(fn, "__qualname__", fn.__name__)
+        return _profileFunction(fn, name)
+
+
+def _profileFunction(fn, name):
+    if not PROFILING_ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = _profile_timer()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _recordProfile(name, _profile_timer() - t0)
+    return wrapper
+
+
+def profiled(target=None):
+    """Record number of calls, total, mean and max time of a function or block of code.
+
+    Use it as a decorator (@profiled, @profiled() or @profiled("name")) or as a context manager
+    (with profiled("name"), the name is required).
+    Times are stored in PROFILE_STATS, print them with printProfileReport().
+    If the environment variable BASIC_PROFILING is 0, functions are not wrapped and blocks do nothing.
+
+    @use @profiled
+         def mySlowFunction(): ...
+    @use with profiled("load data"): data = readFile("my_file.txt")
+    """
+    if callable(target):
+        return _profileFunction(target, getattr(target, "__qualname__", target.__name__))
+    return _ProfiledBlock(target)
+
+
+def getProfileReport(sort="total"):
+    """Return list of rows [name, calls, total, mean, max] for all profiled code, sorted by column sort."""
+    with _profile_lock:
+        rows = [[name, calls, total, total / calls, max_time]
+                for name, (calls, total, max_time) in PROFILE_STATS.items()]
+    column = {"name": 0, "calls": 1, "total": 2, "mean": 3, "max": 4}.get(sort, 2)
+    rows.sort(key=lambda row: row[column], reverse=(column != 0))
+    return rows
+
+
+def printProfileReport(sort="total", print_result=True):
+    """Print table with the calls, total, mean and max time (in seconds) of all profiled code.
+
+    @use printProfileReport(sort="mean")
+    """
+    table = [("name", "calls", "total", "mean", "max")]
+    for name, calls, total, mean_time, max_time in getProfileReport(sort):
+        table.append((name, calls, "{:.6f}".format(total), "{:.6f}".format(mean_time), "{:.6f}".format(max_time)))
+    return printNicer(table, print_result=print_result)
+
+
+def resetProfile():
+    """Remove all times recorded by profiled code."""
+    with _profile_lock:
+        PROFILE_STATS.clear()
+
+
+_MISSING = object()
+
+
+class _MemoCache(object):
+    """Results of one memoized function: LRU in memory, optionally also on disk, with hit/miss/eviction counters."""
+
+    def __init__(self, name, max_size=128, ttl=None, disk=None, disk_backend="sqlite"):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = collections.OrderedDict()  # key -> (time stored, result), least recently used first
+        self._lock = threading.RLock()
+        self._disk = None
+        if disk is not None:
+            self._disk = _MemoDisk(disk, name, disk_backend)
+
+    def get(self, key, disk_key=None):
+        """Return the result stored for key (or disk_key on disk), or _MISSING."""
+        with self._lock:
+            item = self._items.get(key, _MISSING)
+            if item is not _MISSING:
+                if self._alive(item):
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return item[1]
+                del self._items[key]
+                self.evictions += 1
+            if self._disk is not None and disk_key is not None:
+                item = self._disk.get(disk_key)
+                if item is not None:
+                    if self._alive(item):
+                        self._store(key, item)
+                        self.hits += 1
+                        return item[1]
+                    self._disk.delete(disk_key)
+                    self.evictions += 1
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key, result, disk_key=None):
+        item = (time.time(), result)
+        with self._lock:
+            self._store(key, item)
+            if self._disk is not None and disk_key is not None:
+                self._disk.set(disk_key, item)
+
+    def _alive(self, item):
+        return self.ttl is None or time.time() - item[0] < self.ttl
+
+    def _store(self, key, item):
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while self.max_size is not None and len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def info(self):
+        """Return dict with hits, misses, evictions, size (results in memory) and max_size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._items), "max_size": self.max_size}
+
+    def clear(self, disk=False):
+        """Remove the results in memory (and on disk if disk is True) and reset the counters."""
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = 0
+            if disk and self._disk is not None:
+                self._disk.clear()
+
+
+class _MemoDisk(object):
+    """Results of one memoized function in a sqlite or shelve file, so they survive restarts."""
+
+    def __init__(self, filename, name, backend="sqlite"):
+        self.name = name
+        self.backend = backend
+        if backend == "sqlite":
+            self._db = sqlite3.connect(filename, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")  # much faster writes, still safe
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS memoize "
+                             "(name TEXT, key TEXT, value BLOB, PRIMARY KEY (name, key))")
+        elif backend == "shelve":
+            self._db = shelve.open(filename)
+            atexit.register(self._db.close)  # write everything to the file
+        else:
+            raise ValueError("disk_backend can only take values: sqlite, shelve")
+
+    def get(self, key):
+        if self.backend == "sqlite":
+            row = self._db.execute("SELECT value FROM memoize WHERE name = ? AND key = ?", (self.name, key)).fetchone()
+            return pickle.loads(row[0]) if row is not None else None
+        return self._db.get(self.name + ":" + key)
+
+    def set(self, key, item):
+        try:
+            if self.backend == "sqlite":
+                self._db.execute("INSERT OR REPLACE INTO memoize VALUES (?, ?, ?)",
+                                 (self.name, key, pickle.dumps(item, pickle.HIGHEST_PROTOCOL)))
+            else:
+                self._db[self.name + ":" + key] = item
+        except (pickle.PicklingError, TypeError, AttributeError):
+            pass  # results that can not be pickled are only kept in memory
+
+    def delete(self, key):
+        if self.backend == "sqlite":
+            self._db.execute("DELETE FROM memoize WHERE name = ? AND key = ?", (self.name, key))
+        else:
+            self._db.pop(self.name + ":" + key, None)
+
+    def clear(self):
+        if self.backend == "sqlite":
+            self._db.execute("DELETE FROM memoize WHERE name = ?", (self.name,))
+        else:
+            for key in [key for key in self._db.keys() if key.startswith(self.name + ":")]:
+                del self._db[key]
+
+
+def _memoKey(args, kwargs):
+    """Return hashable key for the arguments of a call, or None if they can not be converted."""
+    key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        pass
+    try:
+        return canonicalKey(key, strict=True)
+    except TypeError:
+        return None
+
+
+def _memoDiskKey(args, kwargs):
+    """Return text key for the arguments of a call, the same in every run, or None if they can not be pickled."""
+    try:
+        data = pickle.dumps((args, sorted(kwargs.items())), protocol=4)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    return hashlib.sha1(data).hexdigest()
+
+
+def _memoizeFunction(fn, max_size, ttl, disk, disk_backend):
+    name = "{}.{}".format(getattr(fn, "__module__", None), getattr(fn, "__qualname__", fn.__name__))
+    cache = _MemoCache(name, max_size, ttl, disk, disk_backend)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = _memoKey(args, kwargs)
+        if key is None:  # unhashable arguments, like numpy arrays
+            return fn(*args, **kwargs)
+        disk_key = _memoDiskKey(args, kwargs) if disk is not None else None
+        result = cache.get(key, disk_key)
+        if result is _MISSING:
+            result = fn(*args, **kwargs)
+            cache.put(key, result, disk_key)
+        return result
+    wrapper.cache = cache
+    wrapper.cache_info = cache.info
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def memoize(target=None, max_size=128, ttl=None, disk=None, disk_backend="sqlite"):
+    """Remember the results of a function, so calling it again with the same arguments does not recalculate them.
+
+    Use it as a decorator (@memoize or @memoize(max_size=1000, ttl=60)) or call it with a function.
+    Only the max_size most recently used results are kept (None: no limit), and results older than
+    ttl seconds are recalculated. If disk is a filename, results are also saved there (with sqlite or
+    shelve, see disk_backend), so they are reused after a restart.
+    It is thread-safe, but two threads calling it at the same time with new arguments may both calculate
+    the result. Arguments must be hashable, or lists, dicts and sets of hashable objects; other calls are
+    not cached. Results are shared between calls, so they should not be modified.
+    Call cache_info() on the memoized function to get hits, misses and evictions, and cache_clear() to empty it.
+
+    @use @memoize(max_size=10000)
+         def calculateSomethingSlow(n): ...
+    @use fast_factors = memoize(calculateFactors, disk="factors.db")
+    """
+    if callable(target):
+        return _memoizeFunction(target, max_size, ttl, disk, disk_backend)
+    return lambda fn: _memoizeFunction(fn, target if target is not None else max_size, ttl, disk, disk_backend)
+
+
+def memoizeInPlace(names, module=None, **kwargs):
+    """Replace the functions called names in module (basic.py by default) by memoized versions (see memoize).
+
+    Other functions in the module that call them will use the memoized versions too. kwargs are memoize options.
+    Return dict name -> memoized function. Use unmemoizeInPlace to restore them.
+
+    @use memoizeInPlace(["calculateFactors", "parseString"], max_size=1000)
+    """
+    module = module if module is not None else sys.modules[__name__]
+    memoized = {}
+    for name in names:
+        fn = getattr(module, name)
+        if not hasattr(fn, "cache_info"):
+            fn = memoize(fn, **kwargs)
+            setattr(module, name, fn)
+        memoized[name] = fn
+    return memoized
+
+
+def unmemoizeInPlace(names, module=None):
+    """Restore the functions called names in module (basic.py by default) replaced by memoizeInPlace."""
+    module = module if module is not None else sys.modules[__name__]
+    for name in names:
+        fn = getattr(module, name)
+        if hasattr(fn, "cache_info"):
+            setattr(module, name, fn.__wrapped__)
+
+
 """
 Profiling TIPS:
 
+Quick profiling: decorate hot functions with @profiled (see above), run and call printProfileReport()
+
 Profiling:
 import cProfile
 cProfile.run('mySlowFunction("test_value")')
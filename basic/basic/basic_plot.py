@@ -1,4 +1,13 @@
-import matplotlib.pyplot as plt
+import os
+import time
+try:
+    from basic.basic import lazyImport
+except ImportError:
+    from basic import lazyImport  # running from inside the basic folder
+
+plt = lazyImport("matplotlib.pyplot")  # matplotlib is only imported when something is plotted
+np = lazyImport("numpy")
+futures = lazyImport("concurrent.futures")
 
 
 def transformCurvesToPlot(y_pts, x_pts):
@@ -9,41 +18,107 @@ def transformCurvesToPlot(y_pts, x_pts):
         [[curveA_y], [curveB_y], [curveC_y]]
     and x_pts
         [[curveA_x], [curveB_x], [curveC_x]]
-    and returns a tuple
+    and returns a tuple of 2D numpy arrays (one column per curve)
         ([[curveA_y0, curveB_y0, curveC_y0], [curveA_y1, curveB_y1, curveC_y1]...],
          [[curveA_x0, curveB_x0, curveC_x0], [curveA_x1, curveB_x1, curveC_x1]...])
     
-    It accepts curves of different lengths too. The returned y_pts and x_pts will plot all curves fine.
+    It accepts curves of different lengths too. Shorter curves are padded repeating their last point
+    (empty curves are padded with NaN, which is not plotted). The returned y_pts and x_pts will plot all curves fine.
     
     @use transformCurvesToPlot([[-2,2],[-2,-1,0,1,2],[0,0]], [[0,0],[-2,-1,0,1,2],[-2,2]])
-    @ret ([[-2, -2, 0], [2, -1, 0], [2, 0, 0], [2, 1, 0], [2, 2, 0], [2, 2, 0]],
-          [[0, -2, -2], [0, -1, 2], [0, 0, 2], [0, 1, 2], [0, 2, 2], [0, 2, 2]])
+    @ret (array([[-2, -2, 0], [2, -1, 0], [2, 0, 0], [2, 1, 0], [2, 2, 0], [2, 2, 0]]),
+          array([[0, -2, -2], [0, -1, 2], [0, 0, 2], [0, 1, 2], [0, 2, 2], [0, 2, 2]]))
     """
-    new_y_pts = []
-    new_x_pts = []
-    last_row = max([len(row) for row in y_pts])
-    for i, row in enumerate(y_pts):
-        for j, y in enumerate(row):
-            try:
-                new_y_pts[j].append(y)
-                new_x_pts[j].append(x_pts[i][j])
-            except IndexError:
-                new_y_pts.append([y])
-                new_x_pts.append([x_pts[i][j]])
-        x = x_pts[i][j]
-        while j < last_row:
-            j += 1
-            try:
-                new_y_pts[j].append(y)
-                new_x_pts[j].append(x)
-            except IndexError:
-                new_y_pts.append([y])
-                new_x_pts.append([x])
+    y_curves = [np.asarray(row) for row in y_pts]
+    x_curves = [np.asarray(row) for row in x_pts]
+    num_rows = max([len(row) for row in y_curves]) + 1
+    # Empty curves are float arrays, so the result can hold NaN if there are any
+    new_y_pts = np.empty((num_rows, len(y_curves)), dtype=np.result_type(*y_curves))
+    new_x_pts = np.empty((num_rows, len(y_curves)), dtype=np.result_type(*x_curves))
+    for i, (y, x) in enumerate(zip(y_curves, x_curves)):
+        n = len(y)
+        if n == 0:
+            new_y_pts[:, i] = np.nan
+            new_x_pts[:, i] = np.nan
+            continue
+        new_y_pts[:n, i] = y
+        new_y_pts[n:, i] = y[-1]
+        new_x_pts[:n, i] = x[:n]
+        new_x_pts[n:, i] = x[n - 1]
     return new_y_pts, new_x_pts
 
 
+def downsampleMinMax(y_pts, x_pts, max_points):
+    """Return (y_pts, x_pts) reduced to at most ~max_points points, keeping the shape of the curve.
+
+    Points are split in max_points / 2 consecutive buckets, and only the min and max of every bucket
+    are kept (in their original order), so peaks are never lost. Good for big, noisy curves.
+    x_pts should be sorted. Both are returned as numpy arrays.
+
+    @use y, x = downsampleMinMax(y, x, 2000)
+    """
+    y_pts = np.asarray(y_pts)
+    x_pts = np.asarray(x_pts)
+    n = len(y_pts)
+    num_buckets = max(max_points // 2, 1)
+    if n <= max_points:
+        return y_pts, x_pts
+    bucket = int(np.ceil(n / float(num_buckets)))
+    num_full = n // bucket
+    # Process all full buckets at the same time as rows of a 2D array
+    full = y_pts[:num_full * bucket].reshape(num_full, bucket)
+    offsets = np.arange(num_full) * bucket
+    indices = [offsets + np.argmin(full, axis=1), offsets + np.argmax(full, axis=1)]
+    if num_full * bucket < n:
+        rest = y_pts[num_full * bucket:]
+        indices.append(np.array([num_full * bucket + np.argmin(rest), num_full * bucket + np.argmax(rest)]))
+    indices.append(np.array([0, n - 1]))
+    indices = np.unique(np.concatenate(indices))
+    return y_pts[indices], x_pts[indices]
+
+
+def downsampleLTTB(y_pts, x_pts, max_points):
+    """Return (y_pts, x_pts) reduced to max_points points with Largest-Triangle-Three-Buckets.
+
+    LTTB keeps the points that best preserve the visual shape of the curve (better than min/max for
+    smooth curves, but slower). x_pts should be sorted. Both are returned as numpy arrays.
+
+    @use y, x = downsampleLTTB(y, x, 2000)
+    """
+    y_pts = np.asarray(y_pts)
+    x_pts = np.asarray(x_pts)
+    n = len(y_pts)
+    if n <= max_points or max_points < 3:
+        return y_pts, x_pts
+    y = y_pts.astype(float)
+    x = x_pts.astype(float)
+    # First and last points are always kept, the rest is split in max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    indices = np.empty(max_points, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        # Average of the next bucket is the third vertex of the triangle
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return y_pts[indices], x_pts[indices]
+
+
+def _isManyCurves(y_pts):
+    """Return True if y_pts is a list of curves (a list of lists or arrays)."""
+    return isinstance(y_pts, (list, tuple)) and len(y_pts) > 0 and hasattr(y_pts[0], "__len__") \
+        and not isinstance(y_pts[0], (str, bytes))  # strings are categorical values, not curves
+
+
 def plotLine(y_pts, x_pts=None, y_label=None, x_label=None, title=None, axis=None, style="-",
-             color="", y_scale="linear", x_scale="linear", label=None, show=True):
+             color="", y_scale="linear", x_scale="linear", label=None, show=True, downsample=None,
+             downsample_method="minmax"):
     """Plot a line or point cloud.
     
     It accepts several lines at the same time, if you set y_pts and x_pts as lists of lists.
@@ -61,12 +136,17 @@ def plotLine(y_pts, x_pts=None, y_label=None, x_label=None, title=None, axis=Non
     :param label: text that will be displayed if we show a legend
     :param show: whether to show result or not. Show is blocking (pauses the execution) until the
                  plot window is closed
+    :param downsample: if set, every curve with more points than downsample is reduced to ~downsample
+                       points before plotting (e.g. 2 * width of the plot in pixels). x_pts must be sorted
+    :param downsample_method: "minmax" (see downsampleMinMax, fast) or "lttb" (see downsampleLTTB)
     """
     full_style = (color if color is not None else "") + (style if style is not None else "")
+    if downsample is not None:
+        (y_pts, x_pts) = _downsampleCurves(y_pts, x_pts, downsample, downsample_method)
     if x_pts is None:
         ret = plt.plot(y_pts, full_style, label=label)
     else:
-        if isinstance(y_pts, list) and isinstance(y_pts[0], list):
+        if _isManyCurves(y_pts):
             (y_pts, x_pts) = transformCurvesToPlot(y_pts, x_pts)
         ret = plt.plot(x_pts, y_pts, full_style, label=label)
     if y_label is not None:
@@ -79,12 +159,26 @@ def plotLine(y_pts, x_pts=None, y_label=None, x_label=None, title=None, axis=Non
         plt.axis(axis)
     plt.yscale(y_scale)
     plt.xscale(x_scale)
-    plt.draw()
+    if plt.isinteractive():  # otherwise the figure is drawn when shown or saved
+        plt.draw()
     if show:
         plt.show()
     return ret
 
 
+def _downsampleCurves(y_pts, x_pts, max_points, method):
+    """Downsample one curve or a list of curves. If x_pts is None, x is the index of every point."""
+    downsample = downsampleLTTB if method == "lttb" else downsampleMinMax
+    if _isManyCurves(y_pts):
+        if x_pts is None:
+            x_pts = [np.arange(len(y)) for y in y_pts]
+        curves = [downsample(y, x, max_points) for y, x in zip(y_pts, x_pts)]
+        return [y for y, x in curves], [x for y, x in curves]
+    if x_pts is None:
+        x_pts = np.arange(len(y_pts))
+    return downsample(y_pts, x_pts, max_points)
+
+
 def plotLine1D(y_pts, y_label=None, x_label=None, title=None, y_scale="linear", style=None, label=None,
                show=True):
     """Print line between points in a list.
@@ -110,6 +204,71 @@ def plotCloud2D(y_pts, x_pts, y_label=None, x_label=None, title=None, style="x",
                     y_scale=y_scale, x_scale=x_scale, label=label, show=show)
 
 
+# Plot functions that renderPlots can use, by the "kind" of every spec
+_RENDER_KINDS = {"line": plotLine, "line1D": plotLine1D, "line2D": plotLine2D, "cloud2D": plotCloud2D}
+_render_figure = None  # figure reused by every plot rendered in a renderPlots worker process
+
+
+def renderPlots(specs, out_dir, workers=None, format="png", figsize=None, dpi=None, chunksize=8):
+    """Render many plots to files in out_dir, in parallel, without showing them. Return list with the paths.
+
+    Every spec is a dict with the parameters of plotLine (or plotLine1D, plotLine2D, plotCloud2D) and
+    optionally: "kind" ("line" (default), "line1D", "line2D", "cloud2D"), "name" (file name without extension,
+    "plot_<i>" by default) and "legend" (labels for plotLegend, or True for all labels).
+    Plots are rendered by workers processes (all CPUs if None) using the Agg backend, so the current
+    process plots are not affected. Every worker draws all its plots in the same figure, cleared after saving.
+    If a plot can not be rendered, its path will be None and the error is printed.
+
+    @use renderPlots([{"y_pts": [1, 2, 3], "title": "a"}, {"y_pts": [3, 2, 1], "kind": "cloud2D", "x_pts": [0, 1, 2]}], "charts", workers=4)
+    """
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+    jobs = []
+    for i, spec in enumerate(specs):
+        spec = dict(spec)
+        name = spec.pop("name", "plot_{}".format(i))
+        jobs.append((spec, os.path.join(out_dir, "{}.{}".format(name, format)), format, figsize, dpi))
+    paths = []
+    with futures.ProcessPoolExecutor(max_workers=workers, initializer=_renderInit) as executor:
+        for path, error in executor.map(_renderPlot, jobs, chunksize=chunksize):
+            if error is not None:
+                print("ERROR: plot [{}] could not be rendered: {}".format(path, error))
+                path = None
+            paths.append(path)
+    return paths
+
+
+def _renderInit():
+    """Use the Agg backend (no windows) in a renderPlots worker process."""
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+
+def _renderPlot(job):
+    """Draw one renderPlots spec in the worker figure, save it to path and clear the figure."""
+    global _render_figure
+    (spec, path, format, figsize, dpi) = job
+    if _render_figure is None:
+        _render_figure = plt.figure(figsize=figsize)
+    plt.figure(_render_figure.number)
+    try:
+        legend = spec.pop("legend", None)
+        plot = _RENDER_KINDS[spec.pop("kind", "line")]
+        plot(show=False, **spec)
+        if legend is not None:
+            plotLegend(None if legend is True else legend)
+        _render_figure.savefig(path, format=format, dpi=dpi)
+        error = None
+    except Exception as e:
+        error = "{}: {}".format(type(e).__name__, e)
+    finally:
+        _render_figure.clf()
+        for number in plt.get_fignums():  # figures opened by the plot itself
+            if number != _render_figure.number:
+                plt.close(number)
+    return path, error
+
+
 def plotLegend(labels=None, location="best", boxed=None):
     """Display legend (labels can be set beforehand using other functions like plotLine) in location.
 
@@ -153,7 +312,153 @@ def plotText(y, x, text, style="normal", color="k", fontsize=None, fontweight=No
     """
     ret = plt.text(x, y, text, style=style, color=color, fontsize=fontsize, fontweight=fontweight,
                    verticalalignment=verticalalignment, horizontalalignment=horizontalalignment)
-    plt.draw()
+    if plt.isinteractive():  # otherwise the figure is drawn when shown or saved
+        plt.draw()
     if show:
         plt.show()
     return ret
+
+
+class LivePlot(object):
+    """Line plot for streaming data, that can be updated thousands of times per second.
+
+    Lines are created once (with the same styling arguments as plotLine) and only their data changes.
+    Every curve keeps its last max_points points in a fixed-size ring buffer, so memory does not grow.
+    The figure is redrawn at most max_fps times per second, redrawing only the lines (blitting)
+    unless the axis limits need to change.
+
+    @use live = LivePlot(n_curves=2, max_points=5000, label=["sin", "cos"], title="Metrics")
+         for t in range(100000): live.append([math.sin(t / 100), math.cos(t / 100)])
+
+    :param n_curves: number of curves (lines). append and extend take one value per curve
+    :param max_points: number of points kept (and shown) for every curve
+    :param label: text that will be displayed if we show a legend, or list with one text for every curve
+    :param max_fps: maximum number of redraws per second
+    :param show: whether to show the figure (without blocking) or not
+    The rest of parameters are the ones in plotLine.
+    """
+
+    def __init__(self, n_curves=1, max_points=1000, y_label=None, x_label=None, title=None, axis=None, style="-",
+                 color="", y_scale="linear", x_scale="linear", label=None, max_fps=30, show=True):
+        labels = label if isinstance(label, (list, tuple)) else [label] * n_curves
+        self.lines = plotLine([[]] * n_curves, [[]] * n_curves, y_label=y_label, x_label=x_label, title=title,
+                              axis=axis, style=style, color=color, y_scale=y_scale, x_scale=x_scale,
+                              label=labels[0], show=False)
+        for line, curve_label in zip(self.lines, labels):
+            line.set_label(curve_label)
+            line.set_animated(True)
+        self.figure = plt.gcf()
+        self.axes = plt.gca()
+        self.n_curves = n_curves
+        self.max_points = max_points
+        self.autoscale = axis is None
+        self.min_frame_time = 1.0 / max_fps
+        self.last_frame_time = 0.0
+        self.frames = 0
+        # Every point is written twice (at i and i + max_points), so the last max_points points
+        # are always the contiguous slice [head, head + count) and set_data does not need copies
+        self._x = np.empty(2 * max_points)
+        self._y = np.empty((n_curves, 2 * max_points))
+        self._head = 0
+        self._count = 0
+        self._next_x = 0
+        self._background = None
+        self.figure.canvas.mpl_connect("draw_event", self._saveBackground)
+        if show:
+            plt.show(block=False)
+
+    def __len__(self):
+        return self._count
+
+    def append(self, y, x=None):
+        """Add one point to every curve: y is one value per curve (or a number if there is one curve).
+
+        x is the same for all curves, if None it is the number of points appended before.
+        """
+        if x is None:
+            x = self._next_x
+        self._next_x = x + 1
+        position = (self._head + self._count) % self.max_points
+        self._x[position] = self._x[position + self.max_points] = x
+        self._y[:, position] = self._y[:, position + self.max_points] = y
+        if self._count < self.max_points:
+            self._count += 1
+        else:
+            self._head = (self._head + 1) % self.max_points
+        return self.draw()
+
+    def extend(self, y_pts, x_pts=None):
+        """Add many points at once: y_pts is a list of points for every curve (or one list if there is one curve).
+
+        It is much faster than calling append for every point.
+        """
+        y_pts = np.asarray(y_pts, dtype=float).reshape(self.n_curves, -1)
+        n = y_pts.shape[1]
+        if x_pts is None:
+            x_pts = np.arange(self._next_x, self._next_x + n)
+        x_pts = np.asarray(x_pts, dtype=float)
+        self._next_x = x_pts[-1] + 1 if n else self._next_x
+        if n > self.max_points:  # older points would be overwritten anyway
+            (x_pts, y_pts) = (x_pts[-self.max_points:], y_pts[:, -self.max_points:])
+            self._head = (self._head + self._count + n - self.max_points) % self.max_points
+            self._count = 0
+            n = self.max_points
+        positions = (self._head + self._count + np.arange(n)) % self.max_points
+        self._x[positions] = self._x[positions + self.max_points] = x_pts
+        self._y[:, positions] = self._y[:, positions + self.max_points] = y_pts
+        overflow = max(0, self._count + n - self.max_points)
+        self._head = (self._head + overflow) % self.max_points
+        self._count += n - overflow
+        return self.draw()
+
+    def data(self):
+        """Return (y_pts, x_pts) of the points kept: y_pts has one row for every curve. They are views, not copies."""
+        window = slice(self._head, self._head + self._count)
+        return self._y[:, window], self._x[window]
+
+    def draw(self, force=False):
+        """Redraw the lines if 1 / max_fps seconds have passed since the last redraw (or force). Return True if redrawn."""
+        now = time.perf_counter()
+        if not force and now - self.last_frame_time < self.min_frame_time:
+            return False
+        self.last_frame_time = now
+        self.frames += 1
+        (y_pts, x_pts) = self.data()
+        for line, y in zip(self.lines, y_pts):
+            line.set_data(x_pts, y)
+        canvas = self.figure.canvas
+        if (self.autoscale and self._count and self._rescale(y_pts, x_pts)) or self._background is None \
+                or not getattr(canvas, "supports_blit", False):
+            canvas.draw()  # calls _saveBackground
+        else:
+            canvas.restore_region(self._background)
+        for line in self.lines:
+            self.axes.draw_artist(line)
+        canvas.blit(self.axes.bbox)
+        canvas.flush_events()
+        return True
+
+    def _rescale(self, y_pts, x_pts):
+        """Change the axis limits if some points are out of them. Return True if they changed.
+
+        Limits grow more than needed (x half the window forward), so they do not change in every frame.
+        """
+        (x_min, x_max) = (x_pts.min(), x_pts.max())
+        (y_min, y_max) = (np.nanmin(y_pts), np.nanmax(y_pts))
+        (left, right) = self.axes.get_xlim()
+        (bottom, top) = self.axes.get_ylim()
+        if left <= x_min and x_max <= right and bottom <= y_min and y_max <= top:
+            return False
+        x_span = (x_max - x_min) or 1.0
+        y_span = (y_max - y_min) or 1.0
+        self.axes.set_xlim(x_min, x_max + x_span / 2)
+        self.axes.set_ylim(y_min - y_span / 10, y_max + y_span / 10)
+        return True
+
+    def _saveBackground(self, event):
+        """Keep the figure without the lines, to redraw only the lines on top of it (blitting)."""
+        self._background = self.figure.canvas.copy_from_bbox(self.axes.bbox)
+
+    def close(self):
+        """Close the figure."""
+        plt.close(self.figure)
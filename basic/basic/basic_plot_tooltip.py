@@ -1,12 +1,27 @@
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-import mpld3
-from mpld3 import plugins
+import html
+try:
+    from basic.basic import lazyImport
+except ImportError:
+    from basic import lazyImport  # running from inside the basic folder
+
+# These modules are only imported when they are used
+plt = lazyImport("matplotlib.pyplot")
+np = lazyImport("numpy")
+pd = lazyImport("pandas")
+mpld3 = lazyImport("mpld3")
+plugins = lazyImport("mpld3.plugins")
+
+TOOLTIP_STYLE = """
+table { border-collapse: collapse; border: 1px solid #bbb;}
+th { border-bottom: 1px solid #bbb; }
+td { border-bottom: 1px solid #bbb; }
+table, th, td { font-family: sans-serif; padding: 4; opacity: 0.9; background-color: #fff; }
+"""
 
 
 def plot_df_with_tooltip(df, y_column, x_column=None, tooltip_columns=None, tooltip_title_column=None,
-                         tooltip_style=None, title=None, style="o", color="", show=True):
+                         tooltip_style=None, title=None, style="o", color="", show=True, max_points=None,
+                         sample="stride", html_file=None):
     """Plot scatterplot with tooltips.
 
     Requires style with markers to show tooltips (for example, style "-" will not work, but ".-" will).
@@ -19,33 +34,26 @@ def plot_df_with_tooltip(df, y_column, x_column=None, tooltip_columns=None, tool
     :param tooltip_style: css style for table, as well as any other css attributes desired in the graph
     :param style: plot style (i.e. [o], [.], [.-], [O])
     :param color: plot color (i.e. r, g, b, y c, m, k, w)
+    :param max_points: if df has more rows, only max_points rows are plotted (with tooltips)
+    :param sample: how rows are picked when there are more than max_points: "stride" (evenly spaced rows)
+                   or "random"
+    :param html_file: if given, save the plot to this standalone html file (see save_html_with_tooltip)
+                      instead of showing it with mpld3.show()
 
     @use plot_df_with_tooltip(df, "y", "x", title="Test graph", tooltip_columns=["x", "y", "z"], tooltip_title_column=None, style=".-")
     """
     if tooltip_style is None:
-        tooltip_style = """
-table { border-collapse: collapse; border: 1px solid #bbb;}
-th { border-bottom: 1px solid #bbb; }
-td { border-bottom: 1px solid #bbb; }
-table, th, td { font-family: sans-serif; padding: 4; opacity: 0.9; background-color: #fff; }
-"""
-    tooltip_labels = None
-    if tooltip_columns is not None:
-        tooltip_labels = []
-        for i in range(len(df)):
-            label = df.iloc[[i], :].T
-            if tooltip_title_column is None:
-                label.columns = ["Row: {}".format(i)]
-            else:
-                label.columns = ["{}: {}".format(tooltip_title_column, label.loc[tooltip_title_column].values[0])]
-            if tooltip_columns is not None:
-                label = label.loc[tooltip_columns]
-            tooltip_labels.append(str(label.to_html(header=(tooltip_title_column is not None))))
-
+        tooltip_style = TOOLTIP_STYLE
     if x_column is None:
         df["Row"] = np.arange(len(df))
         x_column = "Row"
 
+    if max_points is not None and len(df) > max_points:
+        if sample == "random":
+            df = df.sample(n=max_points, random_state=0).sort_index()
+        else:
+            df = df.iloc[np.linspace(0, len(df) - 1, max_points).astype(int)]
+
     fig, ax = plt.subplots()
     full_style = (color if color is not None else "") + (style if style is not None else "")
     points = plt.plot(df[x_column], df[y_column], full_style)
@@ -55,16 +63,65 @@ table, th, td { font-family: sans-serif; padding: 4; opacity: 0.9; background-co
     if title is not None:
         plt.title(title, size=20)
 
-    if tooltip_labels is not None:
-        points = plt.gca().lines
-        fig = plt.gcf()
-        tooltip = plugins.PointHTMLTooltip(points[0], tooltip_labels, voffset=10, hoffset=10, css=tooltip_style)
-        plugins.connect(fig, tooltip)
+    if html_file is not None:
+        if tooltip_columns is None:
+            tooltip_columns = list(df.columns)
+        tooltip_values = zip(*[df[column].astype(str).tolist() for column in tooltip_columns])
+        tooltip_title = None
+        if tooltip_title_column is not None:
+            tooltip_title = ["{}: {}".format(tooltip_title_column, value) for value in df[tooltip_title_column].tolist()]
+        save_html_with_tooltip(html_file, tooltip_values, tooltip_names=tooltip_columns, tooltip_title=tooltip_title,
+                               tooltip_style=tooltip_style)
+        return
+
+    tooltip_labels = tooltip_html_from_df(df, tooltip_columns, tooltip_title_column)
+    points = plt.gca().lines
+    fig = plt.gcf()
+    tooltip = plugins.PointHTMLTooltip(points[0], tooltip_labels, voffset=10, hoffset=10, css=tooltip_style)
+    plugins.connect(fig, tooltip)
 
     if show:
         mpld3.show()
 
 
+def tooltip_html_from_df(df, tooltip_columns=None, tooltip_title_column=None):
+    """Return list with one html table (column name and value for every column) for every row in df.
+
+    All tables are built from the same template, converting whole columns to text at once,
+    instead of using pandas to_html for every row. Identical tables are the same string object.
+
+    :param df: pandas data frame
+    :param tooltip_columns: list of columns to show in every table, if None all will be shown
+    :param tooltip_title_column: column whose value is shown (as "column: value") on top of every table
+    """
+    if tooltip_columns is None:
+        tooltip_columns = list(df.columns)
+    rows = "".join('<tr>\n  <th>{}</th>\n  <td>{{{}}}</td>\n</tr>\n'.format(_escape_template(column), i)
+                   for i, column in enumerate(tooltip_columns))
+    title = ""
+    if tooltip_title_column is not None:
+        title = '<thead>\n<tr>\n  <th colspan="2">{}: {{{}}}</th>\n</tr>\n</thead>\n'.format(
+            _escape_template(tooltip_title_column), len(tooltip_columns))
+    template = "<table>\n" + title + "<tbody>\n" + rows + "</tbody>\n</table>\n"
+    columns = [_html_column(df[column]) for column in tooltip_columns]
+    if tooltip_title_column is not None:
+        columns.append(_html_column(df[tooltip_title_column]))
+    interned = {}
+    return [interned.setdefault(label, label) for label in (template.format(*values) for values in zip(*columns))]
+
+
+def _html_column(column):
+    """Return list with the escaped html text of every value in a pandas column (every distinct value escaped once)."""
+    texts = column.astype(str).tolist()
+    escaped = {text: html.escape(text) for text in set(texts)}
+    return [escaped[text] for text in texts]
+
+
+def _escape_template(text):
+    """Escape text to put it in html, and in a str.format template."""
+    return html.escape(str(text)).replace("{", "{{").replace("}", "}}")
+
+
 def html_table_from_lists(list_left=None, list_right=None, left_attribute="th", right_attribute="td", title=None):
     """Create html table, where 2 columns: list_left and list_right."""
     # make sure both lists have the same length (add None for every mismatched position)
@@ -92,25 +149,28 @@ def html_table_from_lists(list_left=None, list_right=None, left_attribute="th",
     return r
 
 
-def add_tooltip_to_plt(tooltip_values=None, tooltip_names=None, tooltip_title=None, tooltip_style=None, show=True):
+def add_tooltip_to_plt(tooltip_values=None, tooltip_names=None, tooltip_title=None, tooltip_style=None, show=True,
+                       html_file=None):
     """Add tooltip to plt.
 
     :param tooltip_values: list of lists, where every sub-list represents the values that we want to show as tooltip
     :param tooltip_names: list, where every ith element if the label name of the ith value in every sub-list in tooltip_values
     :param tooltip_title: string to put on top of every tooltip as the title
     :param tooltip_style: style for html, including but not limited to table css: table, th, td
+    :param html_file: if given, save the plot to this standalone html file (see save_html_with_tooltip)
+                      instead of showing it with mpld3.show()
 
     Requires style with markers to show tooltips (for example, style "-" will not work, but ".-" will).
 
     @use add_tooltip_to_plt([[0,0], [1,1], [0,1], [1,0]], tooltip_names=["y", "x"], tooltip_title="Legend")
     """
     if tooltip_style is None:
-        tooltip_style = """
-table { border-collapse: collapse; border: 1px solid #bbb;}
-th { border-bottom: 1px solid #bbb; }
-td { border-bottom: 1px solid #bbb; }
-table, th, td { font-family: sans-serif; padding: 4; opacity: 0.9; background-color: #fff; }
-"""
+        tooltip_style = TOOLTIP_STYLE
+
+    if html_file is not None:
+        save_html_with_tooltip(html_file, tooltip_values if tooltip_values is not None else [],
+                               tooltip_names=tooltip_names, tooltip_title=tooltip_title, tooltip_style=tooltip_style)
+        return
 
     tooltip_labels = None
     if tooltip_values is not None:
@@ -128,6 +188,165 @@ table, th, td { font-family: sans-serif; padding: 4; opacity: 0.9; background-co
         mpld3.show()
 
 
+
+LAZY_TOOLTIP_JAVASCRIPT = """
+    mpld3.register_plugin("lazyhtmltooltip", LazyHtmlTooltipPlugin);
+    LazyHtmlTooltipPlugin.prototype = Object.create(mpld3.Plugin.prototype);
+    LazyHtmlTooltipPlugin.prototype.constructor = LazyHtmlTooltipPlugin;
+    LazyHtmlTooltipPlugin.prototype.requiredProps = ["id", "data_id", "chunk_size"];
+    LazyHtmlTooltipPlugin.prototype.defaultProps = {hoffset:10, voffset:10};
+    function LazyHtmlTooltipPlugin(fig, props){
+        mpld3.Plugin.call(this, fig, props);
+    };
+
+    LazyHtmlTooltipPlugin.prototype.draw = function(){
+        var props = this.props;
+        var meta = JSON.parse(document.getElementById(props.data_id + "-meta").textContent);
+        var chunks = {};
+        function escape(text){
+            return String(text).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/"/g, "&quot;");
+        }
+        function label(i){
+            // the chunk with point i is only parsed the first time one of its points is hovered
+            var k = Math.floor(i / props.chunk_size);
+            if (!(k in chunks)){
+                var element = document.getElementById(props.data_id + "-" + k);
+                chunks[k] = element ? JSON.parse(element.textContent) : [];
+            }
+            var row = chunks[k][i - k * props.chunk_size];
+            if (row === undefined) return "";
+            var title = meta.title;
+            if (meta.row_titles){
+                title = row[row.length - 1];
+                row = row.slice(0, -1);
+            }
+            var span = meta.names ? 2 : 1;
+            var html = "<table>\\n";
+            if (title !== null) html += '<thead><tr><th colspan="' + span + '">' + escape(title) + "</th></tr></thead>\\n";
+            html += "<tbody>\\n";
+            for (var j = 0; j < row.length; j++){
+                html += "<tr>";
+                if (meta.names) html += "<th>" + escape(j < meta.names.length ? meta.names[j] : "") + "</th>";
+                html += "<td>" + escape(row[j]) + "</td></tr>\\n";
+            }
+            return html + "</tbody>\\n</table>\\n";
+        }
+
+        var obj = mpld3.get_element(props.id);
+        var tooltip = d3.select("body").append("div")
+            .attr("class", "mpld3-tooltip")
+            .style("position", "absolute")
+            .style("z-index", "10")
+            .style("visibility", "hidden");
+
+        obj.elements()
+            .on("mouseover", function(d, i){
+                tooltip.html(label(i))
+                    .style("visibility", "visible");
+            })
+            .on("mousemove", function(d, i){
+                tooltip
+                .style("top", d3.event.pageY + props.voffset + "px")
+                .style("left", d3.event.pageX + props.hoffset + "px");
+            })
+            .on("mouseout", function(d, i){
+                tooltip.style("visibility", "hidden");
+            });
+    };
+"""
+
+
+class LazyHTMLTooltip(object):
+    """mpld3 plugin showing an html table on hover, with the values read from json chunks in the page.
+
+    The chunks are written by save_html_with_tooltip, this only holds the ids to find them.
+    """
+
+    def __init__(self, points, data_id, chunk_size, hoffset=10, voffset=10):
+        from mpld3.utils import get_id
+        self.dict_ = {"type": "lazyhtmltooltip",
+                      "id": get_id(points, "pts"),
+                      "data_id": data_id,
+                      "chunk_size": chunk_size,
+                      "hoffset": hoffset,
+                      "voffset": voffset}
+
+    def get_dict(self):
+        return self.dict_
+
+    def javascript(self):
+        return LAZY_TOOLTIP_JAVASCRIPT
+
+    def css(self):
+        return ""
+
+
+def save_html_with_tooltip(filename, tooltip_values, tooltip_names=None, tooltip_title=None, tooltip_style=None,
+                           fig=None, chunk_size=1000):
+    """Save figure to a standalone html file (no server or internet needed), with tooltips in the first line points.
+
+    Instead of one html string per point inside the figure, the tooltip values are saved once as compact json
+    chunks of chunk_size points, and every chunk is only parsed when one of its points is hovered.
+    The css is written once in the page. Saving time and file size grow linearly with the number of points.
+
+    :param filename: html file to write
+    :param tooltip_values: list of lists (or iterable), where the ith sub-list has the values shown for the ith point
+    :param tooltip_names: list, where every ith element if the label name of the ith value in every sub-list
+    :param tooltip_title: string to put on top of every tooltip, or list with one title for every point
+    :param tooltip_style: css for the page, including but not limited to table css: table, th, td
+    :param fig: figure to save, if None the current figure
+
+    @use save_html_with_tooltip("plot.html", [[0, 0], [1, 1]], tooltip_names=["y", "x"], tooltip_title="Legend")
+    """
+    import json
+    import mpld3.urls
+
+    if tooltip_style is None:
+        tooltip_style = TOOLTIP_STYLE
+    fig = fig if fig is not None else plt.gcf()
+    data_id = "tooltip{}".format(id(fig))
+    row_titles = tooltip_title is not None and not isinstance(tooltip_title, str)
+    if row_titles:
+        tooltip_values = (list(values) + [title] for values, title in zip(tooltip_values, tooltip_title))
+    meta = {"names": list(tooltip_names) if tooltip_names is not None else None,
+            "title": None if row_titles else tooltip_title,
+            "row_titles": row_titles}
+
+    # connect adds to the plugins list in place, so keep a copy to restore the figure afterwards
+    fig_mpld3_plugins = list(fig.mpld3_plugins) if hasattr(fig, "mpld3_plugins") else None
+    plugins.connect(fig, LazyHTMLTooltip(fig.gca().lines[0], data_id, chunk_size))
+    figure_html = mpld3.fig_to_html(fig, template_type="simple", include_libraries=False)
+    if fig_mpld3_plugins is None:
+        del fig.mpld3_plugins
+    else:
+        fig.mpld3_plugins = fig_mpld3_plugins
+
+    def json_script(element_id, value):
+        # "</" can not be inside a script element
+        text = json.dumps(value, separators=(",", ":"), default=str).replace("</", "<\\/")
+        return '<script type="application/json" id="{}">{}</script>\n'.format(element_id, text)
+
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<style>\n{}\n</style>\n'.format(tooltip_style))
+        for library in (mpld3.urls.D3_LOCAL, mpld3.urls.MPLD3MIN_LOCAL):
+            with open(library, encoding="utf-8") as js:
+                f.write('<script type="text/javascript">\n{}\n</script>\n'.format(js.read()))
+        f.write("</head>\n<body>\n")
+        f.write(json_script(data_id + "-meta", meta))
+        chunk = []
+        n_chunks = 0
+        for values in tooltip_values:
+            chunk.append([str(value) if value is not None else "" for value in values])
+            if len(chunk) == chunk_size:
+                f.write(json_script("{}-{}".format(data_id, n_chunks), chunk))
+                chunk = []
+                n_chunks += 1
+        if chunk:
+            f.write(json_script("{}-{}".format(data_id, n_chunks), chunk))
+        f.write(figure_html)
+        f.write("\n</body>\n</html>\n")
+
+
 if __name__ == "__main__":
     input("1. Press ENTER to see next example")
 
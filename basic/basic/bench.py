@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+
+from __future__ import print_function  # convert print in function in python2, needs to be 1st line
+import io
+import os
+import sys
+import json
+import math
+import random
+import shutil
+import platform
+import tempfile
+import argparse
+import inspect
+import subprocess
+try:
+    import basic.basic as basic
+except ImportError:
+    import basic  # running from inside the basic folder
+try:
+    from time import perf_counter as _timer
+except ImportError:
+    _timer = basic.getTime  # python2
+
+
+"""
+Micro-benchmarks for the functions in basic.py.
+
+Every case runs a function over inputs of increasing size, with some warmup runs and then
+several timed runs. The min, median and p95 times are saved as JSON, so two versions of the
+library can be compared to find performance regressions:
+
+    python -m basic.bench --output old.json
+    (change basic.py)
+    python -m basic.bench --output new.json --compare old.json
+
+Use --full to run the big sizes (calculateFactors up to 10^12, removeDuplicatesWithOrder
+on 10^7 items, parseString on 100 MB...). It takes a while.
+"""
+
+
+def _numbers(size, max_value=1000):
+    rnd = random.Random(size)
+    return [rnd.randint(0, max_value) for _ in range(size)]
+
+
+def _tokens(size):
+    rnd = random.Random(size)
+    choices = ["12", "-7", "3.25", "1e5", "hello", "0x1f", "99999999999"]
+    return [rnd.choice(choices) for _ in range(size)]
+
+
+def _text(size, columns=10):
+    """Return a text of roughly size characters, with lines of columns numbers separated by spaces."""
+    rnd = random.Random(size)
+    line = " ".join(str(rnd.randint(0, 99999)) for _ in range(columns)) + "\n"
+    return line * max(size // len(line), 1)
+
+
+def _word(size):
+    half = "".join(random.Random(size).choice("abcdefghij") for _ in range(size // 2))
+    return half + half[::-1]
+
+
+def _file(size, tmpdir):
+    filename = os.path.join(tmpdir, "bench_{}.txt".format(size))
+    if not os.path.exists(filename):
+        basic.writeFile(filename, _text(size))
+    return filename
+
+
+def _consume(iterator):
+    for _ in iterator:
+        pass
+
+
+def _resetFactorTable():
+    basic._factor_table = None
+
+
+def _buildFactorTable(limit):
+    _resetFactorTable()
+    basic.buildFactorTable(limit)
+
+
+def _tableWriterRows(rows):
+    with basic.TableWriter(io.StringIO()) as table:
+        table.writerows(rows)
+
+
+def _memoizedFactors(seq):
+    factors = basic.memoize(basic.calculateFactors, max_size=1000)
+    return [factors(n) for n in seq]
+
+
+def _writeLines(filename, lines):
+    for line in lines:
+        basic.writeFile(filename, line, append=True)
+
+
+def _fileWriterLines(filename, lines):
+    with basic.FileWriter(filename) as f:
+        for line in lines:
+            f.write(line)
+
+
+# Every case is: name -> (function benchmarked, make_args(size, tmpdir), quick sizes, full sizes)
+# make_args is called before every run (not timed), so functions that modify their input are fine.
+# Functions that work on one small value are benchmarked over a list of size values.
+CASES = {
+    "containsChars": (lambda seq: [basic.containsChars(s) for s in seq],
+                      lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isAlphaNumeric": (lambda seq: [basic.isAlphaNumeric(s) for s in seq],
+                       lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isAlpha": (lambda seq: [basic.isAlpha(s) for s in seq],
+                lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isAlphaUpper": (lambda seq: [basic.isAlphaUpper(s) for s in seq],
+                     lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isAlphaLower": (lambda seq: [basic.isAlphaLower(s) for s in seq],
+                     lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isDigit": (lambda seq: [basic.isDigit(s) for s in seq],
+                lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "charToASCII": (lambda seq: [basic.charToASCII(c) for c in seq],
+                    lambda n, d: (_word(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "ASCIIToChar": (lambda seq: [basic.ASCIIToChar(i) for i in seq],
+                    lambda n, d: (_numbers(n, 127),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isInt": (lambda seq: [basic.isInt(s) for s in seq],
+              lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isFloat": (lambda seq: [basic.isFloat(s) for s in seq],
+                lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "classifyTokens": (basic.classifyTokens, lambda n, d: (_tokens(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "inferColumnTypes": (basic.inferColumnTypes, lambda n, d: (basic.parseString(_text(n)),),
+                         [10 ** 5], [10 ** 5, 10 ** 7]),
+    "stringToInt": (lambda seq: [basic.stringToInt(s) for s in seq],
+                    lambda n, d: (["12", "1e5", "-7", "99999999999"] * (n // 4),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "intToBinary": (lambda seq: [basic.intToBinary(i, 16) for i in seq],
+                    lambda n, d: (_numbers(n, 2 ** 16),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "binaryToInt": (lambda seq: [basic.binaryToInt(s) for s in seq],
+                    lambda n, d: (["1011001110001111"] * n,), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "calculateFactors": (basic.calculateFactors,
+                         lambda n, d: (n,), [10 ** 6, 10 ** 8], [10 ** 6, 10 ** 8, 10 ** 10, 10 ** 12]),
+    "buildFactorTable": (_buildFactorTable, lambda n, d: (n,), [10 ** 6], [10 ** 6, 10 ** 7]),
+    "primeFactorization": (lambda seq: [basic.primeFactorization(n) for n in seq],
+                           lambda n, d: ([10 ** 12 + i for i in range(n)],), [10 ** 2], [10 ** 2, 10 ** 4]),
+    "divisorsFromFactorization": (lambda seq: [basic.divisorsFromFactorization(f) for f in seq],
+                                  lambda n, d: ([{2: 6, 3: 4, 5: 2, 7: 1}] * n,), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "factorsMany": (basic.factorsMany, lambda n, d: (range(1, n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isPrime": (lambda seq: [basic.isPrime(n) for n in seq],
+                lambda n, d: ([2 ** 61 - 1 + 2 * i for i in range(n)],), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "iterPrimes": (lambda n: _consume(basic.iterPrimes(n)), lambda n, d: (n,), [10 ** 6], [10 ** 6, 10 ** 8]),
+    "greatestCommonDivisor": (lambda seq: [basic.greatestCommonDivisor(a, 7919 * 104729) for a in seq],
+                              lambda n, d: (_numbers(n, 10 ** 12),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "gcdMany": (basic.gcdMany, lambda n, d: ([6 * x for x in _numbers(n, 10 ** 12)],), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "lcmMany": (basic.lcmMany, lambda n, d: (_numbers(n, 50)[:n // 10 or 1],), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "gcdArray": (basic.gcdArray, lambda n, d: (_numbers(n, 10 ** 12), _numbers(n + 1, 10 ** 12)[:n]),
+                 [10 ** 4], [10 ** 4, 10 ** 6]),
+    "extendedGcd": (lambda seq: [basic.extendedGcd(a, 7919 * 104729) for a in seq],
+                    lambda n, d: (_numbers(n, 10 ** 12),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "modInverse": (lambda seq: [basic.modInverse(a, 1000000007) for a in seq],
+                   lambda n, d: ([x + 1 for x in _numbers(n, 10 ** 9)],), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "isPalindrome": (basic.isPalindrome, lambda n, d: (_word(n),), [10 ** 4, 10 ** 6], [10 ** 4, 10 ** 6, 10 ** 8]),
+    "isPalindromeHalf": (basic.isPalindromeHalf, lambda n, d: (_word(n),), [10 ** 4, 10 ** 6],
+                         [10 ** 4, 10 ** 6, 10 ** 8]),
+    "isPowerOf2": (lambda seq: [basic.isPowerOf2(i) for i in seq],
+                   lambda n, d: (_numbers(n, 2 ** 20),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "getTime": (lambda seq: [basic.getTime() for _ in seq], lambda n, d: (range(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "timeFunction": (lambda seq: [basic.timeFunction(len, seq) for _ in seq],
+                     lambda n, d: (range(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "getCurrentTime": (lambda seq: [basic.getCurrentTime(date=True) for _ in seq],
+                       lambda n, d: (range(n),), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "getFormatedElapsedTime": (lambda seq: [basic.getFormatedElapsedTime(0, t) for t in seq],
+                               lambda n, d: (_numbers(n, 10 ** 6),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "describe": (basic.describe, lambda n, d: (_numbers(n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "getMaxIndex": (basic.getMaxIndex, lambda n, d: (_numbers(n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "getMinIndex": (basic.getMinIndex, lambda n, d: (_numbers(n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "getMaxAndIndex": (basic.getMaxAndIndex, lambda n, d: (_numbers(n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "getMinAndIndex": (basic.getMinAndIndex, lambda n, d: (_numbers(n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "mean": (basic.mean, lambda n, d: (_numbers(n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "orderList": (basic.orderList, lambda n, d: (_numbers(n, n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "externalSort": (lambda seq, d: _consume(basic.externalSort(seq, memory_limit=len(seq) // 10, tmpdir=d)),
+                     lambda n, d: (_numbers(n, n), d), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "removeDuplicates": (basic.removeDuplicates, lambda n, d: (_numbers(n, n // 2),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "removeDuplicatesWithOrder": (basic.removeDuplicatesWithOrder, lambda n, d: (_numbers(n, n // 2),),
+                                  [10 ** 5], [10 ** 5, 10 ** 7]),
+    "iterUnique": (lambda rows: _consume(basic.iterUnique(rows)), lambda n, d: (basic.parseString(_text(n)),),
+                   [10 ** 6], [10 ** 6, 10 ** 8]),
+    "iterUniqueExternal": (lambda seq, d: _consume(basic.iterUniqueExternal(seq, max_items=len(seq) // 10, tmpdir=d)),
+                           lambda n, d: (_numbers(n, n // 2), d), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "iterUniqueApprox": (lambda seq: _consume(basic.iterUniqueApprox(seq, len(seq))),
+                         lambda n, d: (_numbers(n, n // 2),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "canonicalKey": (lambda rows: [basic.canonicalKey(row) for row in rows],
+                     lambda n, d: (basic.parseString(_text(n)),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "memoize": (_memoizedFactors,
+                lambda n, d: (_numbers(n, 2000),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "BloomFilter": (lambda seq: _consume(map(basic.BloomFilter(len(seq)).add, seq)),
+                    lambda n, d: (_numbers(n, n // 2),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "duplicateAllElementsList": (basic.duplicateAllElementsList, lambda n, d: (_numbers(n),),
+                                 [10 ** 5], [10 ** 5, 10 ** 7]),
+    "getRandomInt": (lambda seq: [basic.getRandomInt(i) for i in seq],
+                     lambda n, d: (_numbers(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "getRandomFloat": (lambda seq: [basic.getRandomFloat(0, i) for i in seq],
+                       lambda n, d: (_numbers(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "getRandom": (lambda seq: [basic.getRandom() for _ in seq], lambda n, d: (range(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "getRandomElementInList": (lambda seq: [basic.getRandomElementInList(seq) for _ in seq],
+                               lambda n, d: (_numbers(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "getRandomChar": (lambda seq: [basic.getRandomChar("letters_digits") for _ in seq],
+                      lambda n, d: (range(n),), [10 ** 4], [10 ** 4, 10 ** 6]),
+    "getRandomGenerator": (lambda seq: [basic.getRandomGenerator(42, worker=i) for i in seq],
+                           lambda n, d: (range(n),), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "randomInts": (lambda n: basic.randomInts(n, 0, 1000, seed=42), lambda n, d: (n,), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "randomFloats": (lambda n: basic.randomFloats(n, seed=42), lambda n, d: (n,), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "randomString": (lambda n: basic.randomString(n, "letters_digits", seed=42), lambda n, d: (n,),
+                     [10 ** 5], [10 ** 5, 10 ** 7]),
+    "removeExtraSpaces": (basic.removeExtraSpaces, lambda n, d: (_text(n).replace(" ", "   "),),
+                          [10 ** 5], [10 ** 5, 10 ** 7]),
+    "stream": (lambda filename, out: basic.stream(filename).stripSpaces().filter(basic.containsChars).to(out),
+               lambda n, d: (_file(n, d), os.path.join(d, "stream.txt")), [10 ** 6], [10 ** 6, 10 ** 8]),
+    "LineStream": (lambda lines: _consume(basic.LineStream(lines).stripSpaces().indent("  ")),
+                   lambda n, d: (_text(n).split("\n"),), [10 ** 6], [10 ** 6, 10 ** 8]),
+    "returnTableRow": (lambda seq: [basic.returnTableRow(8, row, align="center") for row in seq],
+                       lambda n, d: ([_numbers(10)] * n,), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "returnTableRowLeft": (lambda seq: [basic.returnTableRowLeft(8, row) for row in seq],
+                           lambda n, d: ([_numbers(10)] * n,), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "returnTableRowRight": (lambda seq: [basic.returnTableRowRight(8, row) for row in seq],
+                            lambda n, d: ([_numbers(10)] * n,), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "printNice": (lambda seq: basic.printNice(seq, print_result=False),
+                  lambda n, d: ([_numbers(10)] * n,), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "printNicer": (lambda rows: basic.printNicer(rows, print_result=False),
+                   lambda n, d: ([_numbers(10)] * n,), [10 ** 3], [10 ** 3, 10 ** 6]),
+    "TableWriter": (_tableWriterRows, lambda n, d: ([_numbers(10)] * n,), [10 ** 3], [10 ** 3, 10 ** 6]),
+    "indentString": (basic.indentString, lambda n, d: (_text(n),), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "convertListToInt": (basic.convertListToInt, lambda n, d: (basic.parseString(_text(n)),),
+                         [10 ** 5], [10 ** 5, 10 ** 7]),
+    "convertListToFloat": (basic.convertListToFloat, lambda n, d: (basic.parseString(_text(n)),),
+                           [10 ** 5], [10 ** 5, 10 ** 7]),
+    "parseString": (lambda text: basic.parseString(text, type="int"), lambda n, d: (_text(n),),
+                    [10 ** 5, 10 ** 6], [10 ** 5, 10 ** 6, 10 ** 8]),
+    "parseStringToArray": (lambda text: basic.parseStringToArray(text, type="int"), lambda n, d: (_text(n),),
+                           [10 ** 5, 10 ** 6], [10 ** 5, 10 ** 6, 10 ** 8]),
+    "iterParse": (lambda filename: _consume(basic.iterParse(filename, type="int")),
+                  lambda n, d: (_file(n, d),), [10 ** 5, 10 ** 6], [10 ** 5, 10 ** 6, 10 ** 8]),
+    "parseFiles": (lambda filenames: _consume(basic.parseFiles(filenames, type="int", workers=2)),
+                   lambda n, d: ([_file(n, d)] * 16,), [10 ** 5], [10 ** 5, 10 ** 7]),
+    "readFile": (basic.readFile, lambda n, d: (_file(n, d),), [10 ** 6], [10 ** 6, 10 ** 8]),
+    "readFileMapped": (lambda filename: basic.readFileMapped(filename).close(),
+                       lambda n, d: (_file(n, d),), [10 ** 6], [10 ** 6, 10 ** 8]),
+    "readFileChunks": (lambda filename: _consume(basic.readFileChunks(filename)),
+                       lambda n, d: (_file(n, d),), [10 ** 6], [10 ** 6, 10 ** 8]),
+    "writeFile": (lambda filename, lines: _writeLines(filename, lines),
+                  lambda n, d: (os.path.join(d, "write.txt"), ["0123456789\n"] * n), [10 ** 3], [10 ** 3, 10 ** 5]),
+    "FileWriter": (_fileWriterLines, lambda n, d: (os.path.join(d, "write.txt"), ["0123456789\n"] * n),
+                   [10 ** 3], [10 ** 3, 10 ** 5]),
+}
+
+# Functions that print, block waiting for the user, call other programs or profile are not benchmarked
+SKIPPED = {"printSeparator", "readFileArgument", "readInputArguments", "callProcess", "askYNQuestion",
+           "runProcesses", "runProcessesAsync", "LazyModule", "lazyImport",
+           "profiled", "getProfileReport", "printProfileReport", "resetProfile",
+           "memoizeInPlace", "unmemoizeInPlace"}
+
+
+def publicFunctions(module=basic):
+    """Return the names of all the public functions and classes defined in module."""
+    return sorted(name for name, obj in vars(module).items()
+                  if not name.startswith("_") and (inspect.isfunction(obj) or inspect.isclass(obj))
+                  and obj.__module__ == module.__name__)
+
+
+def percentile(sorted_values, p):
+    """Return the p-th percentile (0-100) of an already sorted list, using the nearest-rank method."""
+    if not sorted_values:
+        return None
+    rank = int(math.ceil(p / 100.0 * len(sorted_values)))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def timeCase(fn, make_args, size, tmpdir, repeat=7, warmup=1):
+    """Run fn(*make_args(size, tmpdir)) warmup + repeat times and return the stats of the timed runs (seconds)."""
+    times = []
+    for i in range(warmup + repeat):
+        args = make_args(size, tmpdir)
+        t0 = _timer()
+        fn(*args)
+        t1 = _timer()
+        if i >= warmup:
+            times.append(t1 - t0)
+    times.sort()
+    return {"min": times[0], "median": percentile(times, 50), "p95": percentile(times, 95), "repeat": repeat}
+
+
+def runBenchmarks(names=None, full=False, repeat=7, warmup=1, print_input=True):
+    """Run the benchmarks in names (all if None) and return the results as a dict ready to be saved as JSON.
+
+    @use results = runBenchmarks(["parseString", "iterParse"], repeat=3)
+    """
+    if names is None:
+        names = sorted(CASES)
+    results = {}
+    tmpdir = tempfile.mkdtemp(prefix="basic_bench_")
+    try:
+        for name in names:
+            fn, make_args, quick_sizes, full_sizes = CASES[name]
+            _resetFactorTable()  # so cases do not depend on the factor table built by other cases
+            results[name] = {}
+            for size in (full_sizes if full else quick_sizes):
+                stats = timeCase(fn, make_args, size, tmpdir, repeat=repeat, warmup=warmup)
+                results[name][str(size)] = stats
+                if print_input:
+                    print("{:<32}".format(name) + basic.returnTableRowLeft(
+                        14, size, "{:.6f}".format(stats["min"]), "{:.6f}".format(stats["median"]),
+                        "{:.6f}".format(stats["p95"])))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    missing = [name for name in publicFunctions() if name not in CASES and name not in SKIPPED]
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "full": full,
+        "results": results,
+        "not_benchmarked": missing,
+    }
+
+
+# Maximum cold import time (seconds, median) of every module, checked with --imports
+# Measured (median, with .pyc files) about 0.6ms, 14ms, 16ms and 16ms, plus ~40% margin for noisy machines
+IMPORT_BUDGETS = {
+    "basic": 0.002,
+    "basic.basic": 0.02,
+    "basic.basic_plot": 0.022,
+    "basic.basic_plot_tooltip": 0.022,
+}
+# Modules that must never be imported just by importing the modules in IMPORT_BUDGETS
+HEAVY_MODULES = {"matplotlib", "numpy", "pandas", "mpld3", "asyncio", "multiprocessing"}
+
+
+def importTime(module, repeat=7):
+    """Import module in repeat new python processes (python -X importtime) and return its import time stats.
+
+    Return (stats, imported) where stats is like timeCase (seconds) and imported is the set of all
+    top-level modules imported as a consequence.
+
+    @use importTime("basic.basic_plot")
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(basic.__file__)))
+    times = []
+    imported = set()
+    for _ in range(repeat):
+        p = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module], cwd=root,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        # Every line is "import time: self [us] | cumulative [us] | package", nested imports are indented
+        for line in p.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            imported.add(name.strip().split(".")[0])
+            if name.strip() == module and name.startswith(" ") and not name.startswith("  "):
+                times.append(int(cumulative) / 1e6)
+    times.sort()
+    stats = {"min": times[0], "median": percentile(times, 50), "p95": percentile(times, 95), "repeat": repeat}
+    return stats, imported
+
+
+def checkImportBudgets(budgets=None, repeat=7, print_input=True):
+    """Measure cold import time of every module in budgets (IMPORT_BUDGETS by default).
+
+    Return (results, errors): results is {module: stats} and errors a list of messages for the modules
+    that are over budget or import any of HEAVY_MODULES.
+    """
+    budgets = IMPORT_BUDGETS if budgets is None else budgets
+    results = {}
+    errors = []
+    for module, budget in sorted(budgets.items()):
+        stats, imported = importTime(module, repeat)
+        results[module] = stats
+        if print_input:
+            print("{:<32}".format("import " + module) + basic.returnTableRowLeft(
+                14, "budget {}".format(budget), "{:.6f}".format(stats["min"]), "{:.6f}".format(stats["median"]),
+                "{:.6f}".format(stats["p95"])))
+        if stats["median"] > budget:
+            errors.append("import {} takes {:.6f}s (budget {}s)".format(module, stats["median"], budget))
+        heavy = sorted(imported & HEAVY_MODULES)
+        if heavy:
+            errors.append("import {} imports {}".format(module, ", ".join(heavy)))
+    return results, errors
+
+
+def compareResults(old, new, threshold=1.1, stat="median"):
+    """Compare two results of runBenchmarks and return a list of (name, size, old, new, ratio) slower than threshold.
+
+    @use compareResults(json.load(open("old.json")), json.load(open("new.json")), threshold=1.2)
+    """
+    regressions = []
+    for name, sizes in sorted(new["results"].items()):
+        for size, stats in sorted(sizes.items(), key=lambda kv: int(kv[0])):
+            try:
+                old_time = old["results"][name][size][stat]
+            except KeyError:
+                continue
+            ratio = stats[stat] / old_time if old_time > 0 else float("inf")
+            if ratio > threshold:
+                regressions.append((name, int(size), old_time, stats[stat], ratio))
+    for module, stats in sorted(new.get("import_time", {}).items()):
+        old_stats = old.get("import_time", {}).get(module)
+        if old_stats is None:
+            continue
+        ratio = stats[stat] / old_stats[stat] if old_stats[stat] > 0 else float("inf")
+        if ratio > threshold:
+            regressions.append(("import " + module, 0, old_stats[stat], stats[stat], ratio))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the functions in basic.py")
+    parser.add_argument("names", nargs="*", help="functions to benchmark (all if empty)")
+    parser.add_argument("--full", action="store_true", help="use the big input sizes")
+    parser.add_argument("--repeat", type=int, default=7, help="number of timed runs per size")
+    parser.add_argument("--warmup", type=int, default=1, help="number of untimed runs per size")
+    parser.add_argument("--output", help="save the results in this JSON file")
+    parser.add_argument("--compare", help="JSON file of a previous run, print the regressions against it")
+    parser.add_argument("--threshold", type=float, default=1.1, help="new/old ratio considered a regression")
+    parser.add_argument("--imports", action="store_true",
+                        help="also measure cold import times, and fail if they are over IMPORT_BUDGETS")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in CASES]
+    if unknown:
+        print("ERROR: unknown benchmarks: {}".format(", ".join(unknown)))
+        sys.exit(1)
+    print("{:<32}".format("function") + basic.returnTableRowLeft(14, "size", "min (s)", "median (s)", "p95 (s)"))
+    results = runBenchmarks(args.names or None, full=args.full, repeat=args.repeat, warmup=args.warmup)
+    if results["not_benchmarked"]:
+        print("Not benchmarked: {}".format(", ".join(results["not_benchmarked"])))
+    import_errors = []
+    if args.imports:
+        results["import_time"], import_errors = checkImportBudgets(repeat=args.repeat)
+        for error in import_errors:
+            print("ERROR: " + error)
+    if args.output:
+        basic.writeFile(args.output, json.dumps(results, indent=2, sort_keys=True), print_input=True)
+    if args.compare:
+        old = json.loads(basic.readFile(args.compare, "{}"))
+        if "results" not in old:
+            print("ERROR: could not read results from [{}]".format(args.compare))
+            sys.exit(1)
+        regressions = compareResults(old, results, threshold=args.threshold)
+        for name, size, old_time, new_time, ratio in regressions:
+            print("REGRESSION {} (size {}): {:.6f}s -> {:.6f}s ({:.2f}x)".format(name, size, old_time, new_time, ratio))
+        if regressions:
+            sys.exit(1)
+        print("No regressions found")
+    if import_errors:
+        sys.exit(1)